@@ -1,12 +1,35 @@
+import operator
+from datetime import datetime, timedelta
 from flask import request, jsonify, Blueprint
-from App.models import Inventory
+from sqlalchemy import func, select, true, update
+from App.models import Inventory, ServiceTicket, inventory_daily_usage, inventory_tickets
 from App.extensions import db
 from marshmallow.exceptions import ValidationError
-from .schemas import inventory_schema, inventories_schema
+from App.utils.loading import eager_load
+from App.utils.pagination import InvalidCursor, get_limit, keyset_page
+from App.utils.cache_tags import cached_view, mark_stale
+from App.utils.changelog import log_changes
+from App.utils.deletes import delete_row
+from App.utils.imports import IMPORT_FORMATS, batched, import_format, read_rows
+from App.utils.autocomplete import inventory_suggestions
+from App.utils.upserts import insert_or_update
+from App.utils.versioning import collection_etag, conditional, row_etag, touch_rows
+from .schemas import inventory_schema, inventories_schema, inventory_import_schema
 
 # Define the Blueprint for inventory
 inventory_bp = Blueprint('inventory', __name__)
 
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100  # Rejected rows beyond this are counted, not itemised
+
+# Sort keys for GET /inventory/, each backed by an index ending in item_id
+INVENTORY_SORT_KEYS = {
+    "name": [Inventory.name_key, Inventory.item_id],
+    "price": [Inventory.price, Inventory.item_id],
+    "quantity": [Inventory.quantity, Inventory.item_id],
+    "item_id": [Inventory.item_id],
+}
+
 # CREATE Inventory Item
 @inventory_bp.route("/", methods=["POST"])
 def create_inventory_item():
@@ -32,21 +55,194 @@ def create_inventory_item():
         return jsonify({"error": str(e)}), 500
 
 
-# READ All Inventory Items
+# IMPORT (UPSERT BY SKU) Inventory Items from CSV or NDJSON
+@inventory_bp.route("/import", methods=["POST"])
+def import_inventory_items():
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    file_format = request.args.get("format") or (
+        import_format(upload.filename, upload.mimetype) if upload else import_format(mimetype=request.mimetype)
+    )
+    if file_format not in IMPORT_FORMATS:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    summary = {"inserted": 0, "updated": 0, "duplicates": 0, "rejected": 0, "errors": []}
+    try:
+        # One batch in memory at a time, each committed on its own
+        for batch in batched(read_rows(stream, file_format), IMPORT_BATCH_SIZE):
+            _import_batch(batch, summary)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), **summary}), 500
+
+    status = 200 if not summary["rejected"] else 207 if summary["inserted"] or summary["updated"] else 400
+    return jsonify({
+        "message": f"{summary['inserted']} inserted, {summary['updated']} updated, {summary['rejected']} rejected",
+        **summary
+    }), status
+
+
+def _import_batch(batch, summary):
+    """
+    Validate one batch in a single schema pass and upsert its valid rows
+    with one executemany; a sku repeated in the batch keeps its last row,
+    and the earlier ones are counted as duplicates.
+    """
+    def reject(line_number, messages):
+        summary["rejected"] += 1
+        if len(summary["errors"]) < MAX_IMPORT_ERRORS:
+            summary["errors"].append({"line": line_number, "errors": messages})
+
+    parsed = []
+    for line_number, row in batch:
+        if row is None:
+            reject(line_number, {"_schema": ["Unreadable row"]})
+        else:
+            parsed.append((line_number, row))
+
+    rows = [row for _, row in parsed]
+    errors = inventory_import_schema.validate(rows)
+    for i, (line_number, _) in enumerate(parsed):
+        if i in errors:
+            reject(line_number, errors[i])
+    valid = [rows[i] for i in range(len(rows)) if i not in errors]
+    if not valid:
+        return
+
+    by_sku = {row["sku"]: row for row in inventory_import_schema.load(valid)}
+    known = dict(db.session.execute(
+        select(Inventory.sku, Inventory.item_id).where(Inventory.sku.in_(by_sku))
+    ).all())
+
+    table = Inventory.__table__
+    db.session.execute(
+        insert_or_update(table, [table.c.sku], [table.c.item_name, table.c.quantity, table.c.price]),
+        list(by_sku.values())
+    )
+    summary["duplicates"] += len(valid) - len(by_sku)
+    summary["updated"] += len(known)
+    summary["inserted"] += len(by_sku) - len(known)
+
+    # The upsert bypasses the unit of work, so report what it touched
+    new_ids = list(db.session.scalars(
+        select(Inventory.item_id).where(Inventory.sku.in_(by_sku.keys() - known.keys()))
+    )) if len(by_sku) > len(known) else []
+    mark_stale("inventory", *(f"inventory:{item_id}" for item_id in known.values()))
+    log_changes(table, known.values(), "update")
+    log_changes(table, new_ids, "insert")
+
+
+# READ All Inventory Items (filtered, sorted, keyset paginated)
 @inventory_bp.route("/", methods=["GET"])
+@conditional(lambda: collection_etag("inventory", "inventory_tickets"))
+@cached_view("inventory", "inventory_tickets")
 def get_all_inventory_items():
     try:
-        inventory_items = Inventory.query.all()
-        return jsonify(inventories_schema.dump(inventory_items)), 200
+        sort = request.args.get("sort", "name")
+        descending = sort.startswith("-")
+        columns = INVENTORY_SORT_KEYS.get(sort.lstrip("-"))
+        if columns is None:
+            return jsonify({"error": f"sort must be one of {sorted(INVENTORY_SORT_KEYS)}, optionally prefixed with '-'"}), 400
+
+        query = _filter_inventory(Inventory.query.options(*eager_load(inventories_schema)), request.args)
+        inventory_items, next_cursor = keyset_page(
+            query, columns, after=request.args.get("after"), limit=get_limit(), descending=descending
+        )
+        return jsonify({
+            "items": inventories_schema.dump(inventory_items),
+            "next_cursor": next_cursor
+        }), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def _filter_inventory(query, args):
+    """
+    Push the listing filters into SQL. The name prefix becomes a range on
+    the indexed lower(item_name), so it seeks instead of scanning a LIKE.
+    """
+    prefix = args.get("name_prefix", "").lower()
+    if prefix:
+        query = query.filter(Inventory.name_key >= prefix)
+        if ord(prefix[-1]) < 0x10FFFF:
+            query = query.filter(Inventory.name_key < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    for name, column, type_, compare in (
+        ("min_qty", Inventory.quantity, int, operator.ge),
+        ("max_qty", Inventory.quantity, int, operator.le),
+        ("min_price", Inventory.price, float, operator.ge),
+        ("max_price", Inventory.price, float, operator.le),
+    ):
+        value = args.get(name, type=type_)
+        if value is not None:
+            query = query.filter(compare(column, value))
+    return query
+
+
+# SUGGEST Inventory Items by name prefix (autocomplete)
+@inventory_bp.route("/suggest", methods=["GET"])
+def suggest_inventory_items():
+    try:
+        suggestions = inventory_suggestions().suggest(
+            request.args.get("q", ""), get_limit(default=10, maximum=50)
+        )
+        return jsonify({"suggestions": suggestions}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# LOW-STOCK report: items at or below their reorder point, with recent usage
+@inventory_bp.route("/low-stock", methods=["GET"])
+def get_low_stock_items():
+    try:
+        days = max(1, min(request.args.get("days", 30, type=int), 365))
+
+        # Reads only the low-stock entries of ix_inventory_low_stock_item_id, never the whole catalogue
+        low_stock = db.session.execute(
+            select(Inventory.item_id, Inventory.item_name, Inventory.quantity, Inventory.reorder_point)
+            .where(Inventory.low_stock == true())
+            .order_by(Inventory.item_id)
+        ).all()
+
+        usage = {}
+        if low_stock:
+            since = datetime.utcnow().date() - timedelta(days=days - 1)
+            usage = dict(db.session.execute(
+                select(inventory_daily_usage.c.item_id, func.sum(inventory_daily_usage.c.quantity))
+                .where(
+                    inventory_daily_usage.c.item_id.in_([row.item_id for row in low_stock]),
+                    inventory_daily_usage.c.day >= since
+                )
+                .group_by(inventory_daily_usage.c.item_id)
+            ).all())
+
+        items = []
+        for row in low_stock:
+            used = max(usage.get(row.item_id) or 0, 0)
+            daily = used / days
+            items.append({
+                **row._asdict(),
+                "used": used,
+                "daily_usage": round(daily, 2),
+                "days_of_cover": round(row.quantity / daily, 1) if daily else None
+            })
+        # Most urgent first; items nobody is using go last
+        items.sort(key=lambda item: (item["days_of_cover"] is None, item["days_of_cover"] or 0))
+
+        return jsonify({"days": days, "items": items}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # READ Single Inventory Item
 @inventory_bp.route("/<int:item_id>", methods=["GET"])
+@conditional(lambda item_id: row_etag(Inventory, item_id))
 def get_inventory_item(item_id):
     try:
-        inventory_item = Inventory.query.get(item_id)
+        inventory_item = db.session.get(Inventory, item_id, options=eager_load(inventory_schema))
         if not inventory_item:
             return jsonify({"error": "Inventory item not found"}), 404
 
@@ -69,6 +265,9 @@ def update_inventory_item(item_id):
         if "quantity" in data and data["quantity"] < 0:
             return jsonify({"error": "Quantity cannot be negative"}), 400
 
+        if request.if_match:
+            return _compare_and_set(inventory_item, data)
+
         inventory_item = inventory_schema.load(data, instance=inventory_item, partial=True)
 
         # Commit changes to the database
@@ -89,18 +288,61 @@ def update_inventory_item(item_id):
         return jsonify({"error": str(e)}), 500
 
 
+def _compare_and_set(inventory_item, data):
+    """
+    Apply a PUT only if the item is still at the version the client read
+    (its ETag, sent back in If-Match), as one conditional UPDATE: a write
+    that lands in between makes it match no row instead of being lost.
+    """
+    errors = inventory_schema.validate(data, partial=True)
+    if errors:
+        return jsonify({"error": errors}), 400
+
+    item_id, version = inventory_item.item_id, inventory_item.version
+    changes = {key: data[key] for key in ("item_name", "quantity", "price") if key in data}
+    if request.if_match.contains(row_etag(Inventory, item_id)):
+        updated = db.session.execute(
+            update(Inventory)
+            .where(Inventory.item_id == item_id, Inventory.version == version)
+            .values(version=Inventory.version + 1, **changes)
+        ).rowcount
+    else:
+        updated = 0
+    if not updated:
+        db.session.rollback()
+        return jsonify({"error": "Inventory item was modified; fetch it again and retry"}), 412
+
+    # The UPDATE bypasses the unit of work, so report it
+    mark_stale("inventory", f"inventory:{item_id}")
+    log_changes(Inventory.__table__, [item_id], "update")
+    db.session.commit()
+
+    response = jsonify({
+        "message": "Inventory item updated successfully",
+        "data": inventory_schema.dump(db.session.get(Inventory, item_id))
+    })
+    response.set_etag(row_etag(Inventory, item_id))
+    return response, 200
+
+
 # DELETE Inventory Item
 @inventory_bp.route("/<int:item_id>", methods=["DELETE"])
 def delete_inventory_item(item_id):
     try:
-        inventory_item = Inventory.query.get(item_id)
-        if not inventory_item:
-            return jsonify({"error": "Inventory item not found"}), 404
+        # Tickets listing the item change payload when its lines cascade away
+        ticket_ids = db.session.scalars(
+            select(inventory_tickets.c.ticket_id).where(inventory_tickets.c.item_id == item_id)
+        ).all()
 
-        # Delete the inventory item from the database
-        db.session.delete(inventory_item)
+        # One DELETE; the database cascades to its ticket lines and usage history
+        if not delete_row(Inventory, item_id):
+            db.session.rollback()
+            return jsonify({"error": "Inventory item not found"}), 404
+        touch_rows(ServiceTicket, ticket_ids)
+        mark_stale(inventory_tickets.name)
         db.session.commit()
 
         return jsonify({"message": "Inventory item deleted successfully"}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
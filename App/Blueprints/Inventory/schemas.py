@@ -1,3 +1,4 @@
+from marshmallow import EXCLUDE, fields, validate
 from App.models import Inventory, Customer, ServiceTicket, Mechanics
 from App.extensions import ma
 
@@ -6,6 +7,7 @@ class CustomerSchema(ma.SQLAlchemyAutoSchema):
         model = Customer
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
 
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
@@ -13,6 +15,7 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
         model = ServiceTicket
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
 
 class MechanicSchema(ma.SQLAlchemyAutoSchema):
@@ -20,15 +23,35 @@ class MechanicSchema(ma.SQLAlchemyAutoSchema):
         model = Mechanics
         include_relationships = True
         load_instance = True
+        dump_only = ("ticket_count", "version")
 
 class InventorySchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Inventory  # Link the schema to the Inventory model
         include_relationships = True  # Include relationships if any
         load_instance = True  # Deserialize to model instances
+        dump_only = ("version",)
+        exclude = ("name_key", "low_stock")  # Query-only sort key and flag
+
+class InventoryImportSchema(InventorySchema):
+    """
+    One row of a POST /inventory/import file. Rows are validated as dicts
+    and upserted set-based by sku, never turned into ORM instances.
+    reorder_point is shop policy, not supplier data, so imports leave it alone.
+    """
+    sku = fields.String(required=True, validate=validate.Length(min=1, max=64))
+    quantity = fields.Integer(required=True, validate=validate.Range(min=0))
+
+    class Meta(InventorySchema.Meta):
+        load_instance = False
+        exclude = ("item_id", "version", "name_key", "low_stock", "reorder_point", "service_tickets")
+        unknown = EXCLUDE  # Supplier files carry extra columns
 
 # Single inventory item schema
 inventory_schema = InventorySchema()
 
 # Multiple inventory items schema
-inventories_schema = InventorySchema(many=True)
\ No newline at end of file
+inventories_schema = InventorySchema(many=True)
+
+# Batches of import rows
+inventory_import_schema = InventoryImportSchema(many=True)
\ No newline at end of file
@@ -1,11 +1,23 @@
+from datetime import datetime
 from flask import request, jsonify
 from flask import current_app as app
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from marshmallow.exceptions import ValidationError
-from App.models import Mechanics, service_mechanics
-from App.extensions import db, limiter, cache
+from App.models import Mechanics, ServiceTicket, mechanic_ticket_rollups, service_mechanics
+from App.extensions import db, limiter
+from App.utils.loading import eager_load
+from App.utils.cache_tags import cached_view
+from App.utils.deletes import delete_row
+from App.utils.junctions import unlink_tickets
+from App.utils.pagination import InvalidCursor, get_limit, keyset_page
+from App.utils.periods import parse_period
+from App.utils.versioning import collection_etag, conditional, row_etag
 from . import mechanics_bp
-from .schemas import mechanic_schema, mechanics_schema
+from .schemas import mechanic_schema, mechanics_schema, service_tickets_schema
+
+LEADERBOARD_DEFAULT_TOP = 10
+LEADERBOARD_MAX_TOP = 100
 
 
 # ROUTES — MECHANICS CRUD
@@ -43,10 +55,11 @@ def add_mechanic():
 
 # GET all mechanics
 @mechanics_bp.route("/", methods=["GET"])
-@cache.cached(timeout=60)  # Cache for 60 seconds
+@conditional(lambda: collection_etag("mechanics", "service_mechanics"))
+@cached_view("mechanics", "service_mechanics")
 def get_mechanics():
     try:
-        all_mechanics = Mechanics.query.all()
+        all_mechanics = Mechanics.query.options(*eager_load(mechanics_schema)).all()
         return jsonify(mechanics_schema.dump(all_mechanics)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -54,10 +67,11 @@ def get_mechanics():
 
 # GET a single mechanic
 @mechanics_bp.route("/<int:mechanic_id>", methods=["GET"])
-@cache.cached(timeout=60)  # Cache for 60 seconds
+@conditional(lambda mechanic_id: row_etag(Mechanics, mechanic_id))
+@cached_view("mechanics:{mechanic_id}")
 def get_mechanic(mechanic_id):
     try:
-        mechanic = Mechanics.query.get(mechanic_id)
+        mechanic = db.session.get(Mechanics, mechanic_id, options=eager_load(mechanic_schema))
         if not mechanic:
             return jsonify({"message": "Mechanic not found"}), 404
 
@@ -66,19 +80,65 @@ def get_mechanic(mechanic_id):
         return jsonify({"error": str(e)}), 500
 
 
+# GET a mechanic's tickets, newest first (cursor paginated)
+@mechanics_bp.route("/<int:mechanic_id>/tickets", methods=["GET"])
+@cached_view("service_ticket", "service_mechanics", "inventory_tickets")
+def get_mechanic_tickets(mechanic_id):
+    try:
+        if not db.session.get(Mechanics, mechanic_id):
+            return jsonify({"message": "Mechanic not found"}), 404
+        try:
+            date_from = _parse_date_arg("from")
+            date_to = _parse_date_arg("to")
+        except ValueError:
+            return jsonify({"error": "from/to must be ISO 8601 dates"}), 400
+
+        # Half-open range [from, to), as in the ticket export
+        query = ServiceTicket.query.join(
+            service_mechanics, service_mechanics.c.ticket_id == ServiceTicket.ticket_id
+        ).filter(service_mechanics.c.mechanic_id == mechanic_id)
+        if date_from:
+            query = query.filter(ServiceTicket.date >= date_from)
+        if date_to:
+            query = query.filter(ServiceTicket.date < date_to)
+
+        service_tickets, next_cursor = keyset_page(
+            query.options(*eager_load(service_tickets_schema)),
+            [ServiceTicket.date, ServiceTicket.ticket_id],
+            after=request.args.get("after"),
+            limit=get_limit(),
+            descending=True
+        )
+        return jsonify({
+            "tickets": service_tickets_schema.dump(service_tickets),
+            "next_cursor": next_cursor
+        }), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    return datetime.fromisoformat(value) if value else None
+
+
 # DELETE mechanic
 @mechanics_bp.route("/<int:mechanic_id>", methods=["DELETE"])
 def delete_mechanic(mechanic_id):
     try:
-        mechanic = Mechanics.query.get(mechanic_id)
-        if not mechanic:
+        # Links go first, in one DELETE, so they are logged and counted; the
+        # mechanic's rollups cascade with it
+        unlink_tickets(mechanic_id)
+        if not delete_row(Mechanics, mechanic_id):
+            db.session.rollback()
             return jsonify({"message": "Mechanic not found"}), 404
-
-        db.session.delete(mechanic)
         db.session.commit()
 
         return jsonify({"message": "Mechanic deleted successfully"}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
@@ -96,7 +156,7 @@ def update_mechanic(mechanic_id):
 
         # Update fields
         for key, value in data.items():
-            if hasattr(mechanic, key):
+            if key not in ("version", "ticket_count", "tickets") and hasattr(mechanic, key):
                 setattr(mechanic, key, value)
 
         db.session.commit()
@@ -124,30 +184,70 @@ def health_check():
 
 
 @mechanics_bp.route("/most-tickets", methods=["GET"])
-@cache.cached(timeout=60)
+@cached_view("mechanics", "service_mechanics")
 def get_mechanic_with_most_tickets():
     try:
-        print("Request Headers:", request.headers)  # Debugging
-        print("Request Method:", request.method)    # Debugging
-
-        # Query the mechanic with the most tickets
-        result = db.session.query(
-            Mechanics.name, db.func.count(service_mechanics.c.ticket_id).label("ticket_count")
-        ).join(service_mechanics, Mechanics.mechanic_id == service_mechanics.c.mechanic_id) \
-         .group_by(Mechanics.name) \
-         .order_by(db.desc("ticket_count")) \
-         .first()
+        # One step down ix_mechanics_ticket_count_mechanic_id
+        result = db.session.execute(
+            select(Mechanics.mechanic_id, Mechanics.name, Mechanics.ticket_count)
+            .where(Mechanics.ticket_count > 0)
+            .order_by(Mechanics.ticket_count.desc(), Mechanics.mechanic_id)
+            .limit(1)
+        ).first()
 
         if not result:
             return jsonify({"message": "No mechanics or tickets found"}), 404
 
         return jsonify({
+            "mechanic_id": result.mechanic_id,
             "mechanic": result.name,
             "ticket_count": result.ticket_count
         }), 200
 
     except Exception as e:
-        print("Error:", str(e))  # Debugging
+        return jsonify({"error": str(e)}), 500
+
+
+# GET top mechanics by ticket count, all-time or for a month/year
+@mechanics_bp.route("/leaderboard", methods=["GET"])
+@cached_view("mechanics", "service_mechanics")
+def get_leaderboard():
+    try:
+        top = request.args.get("top", LEADERBOARD_DEFAULT_TOP, type=int)
+        if top is None or not 1 <= top <= LEADERBOARD_MAX_TOP:
+            return jsonify({"error": f"top must be between 1 and {LEADERBOARD_MAX_TOP}"}), 400
+        period = request.args.get("period")
+        try:
+            months = parse_period(period)
+        except ValueError:
+            return jsonify({"error": "period must be YYYY or YYYY-MM"}), 400
+
+        if months is None:
+            # All-time: read the maintained counters off their index
+            ticket_count = Mechanics.ticket_count
+            statement = select(Mechanics.mechanic_id, Mechanics.name, ticket_count).where(ticket_count > 0)
+        else:
+            # A year sums at most twelve monthly rollup rows per mechanic
+            ticket_count = func.sum(mechanic_ticket_rollups.c.ticket_count)
+            statement = (
+                select(Mechanics.mechanic_id, Mechanics.name, ticket_count)
+                .join(mechanic_ticket_rollups, mechanic_ticket_rollups.c.mechanic_id == Mechanics.mechanic_id)
+                .where(mechanic_ticket_rollups.c.period >= months[0], mechanic_ticket_rollups.c.period < months[1])
+                .group_by(Mechanics.mechanic_id, Mechanics.name)
+                .having(ticket_count > 0)
+            )
+        rows = db.session.execute(
+            statement.order_by(ticket_count.desc(), Mechanics.mechanic_id).limit(top)
+        ).all()
+
+        return jsonify({
+            "period": period,
+            "mechanics": [
+                {"rank": rank, "mechanic_id": mechanic_id, "name": name, "ticket_count": count}
+                for rank, (mechanic_id, name, count) in enumerate(rows, start=1)
+            ]
+        }), 200
+    except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
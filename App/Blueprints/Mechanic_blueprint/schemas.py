@@ -10,6 +10,7 @@ class CustomerSchema(ma.SQLAlchemyAutoSchema):
         model = Customer
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
 
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
@@ -17,6 +18,7 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
         model = ServiceTicket
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
 
 class MechanicSchema(ma.SQLAlchemyAutoSchema):
@@ -24,7 +26,13 @@ class MechanicSchema(ma.SQLAlchemyAutoSchema):
         model = Mechanics
         include_relationships = True
         load_instance = True
+        # Maintained by the server, never written by clients
+        dump_only = ("ticket_count", "version")
+        # Write-only collection; ticket_count summarizes it
+        exclude = ("tickets",)
 
 
 mechanic_schema = MechanicSchema()
 mechanics_schema = MechanicSchema(many=True)
+
+service_tickets_schema = ServiceTicketSchema(many=True)
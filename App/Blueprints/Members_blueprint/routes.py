@@ -1,11 +1,25 @@
-from flask import request, jsonify
+from datetime import datetime
+from flask import current_app, request, jsonify, g
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from marshmallow.exceptions import ValidationError
-from App.models import Customer
+from App.models import Customer, ServiceTicket
 from App.extensions import db, limiter
-from App.utils.util import token_required, encode_token  # Import encode_token
+from App.utils.util import bearer_token, token_required, encode_token  # Import encode_token
+from App.utils.tokens import revoked_tokens, token_cache, token_id, token_key
+from App.utils.loading import eager_load
+from App.utils.passwords import PasswordHasherBusy, password_hasher
+from App.utils.cache_tags import cached_view, mark_stale
+from App.utils.deletes import delete_row, tickets_deleted
+from App.utils.summaries import customer_summary
+from App.utils.upserts import insert_returning_ids
 from . import customers_bp
-from .schemas import customers_schema, customer_schema, login_schema
+from .schemas import bulk_customers_schema, customers_schema, customer_schema, login_schema
+
+# Every row costs one password hash, so a batch must finish within a request timeout
+MAX_BULK_CUSTOMERS = 1000
+SUMMARY_DEFAULT_TOP = 3
+SUMMARY_MAX_TOP = 20
 
 
 # ---------------------------------------------------------
@@ -40,12 +54,94 @@ def add_customer():
 
     except ValidationError as err:
         return jsonify({"error": err.messages}), 400
+    except PasswordHasherBusy as e:
+        return _busy(e)
     except Exception as e:
         print("Error:", str(e))  # Debugging
         return jsonify({"error": str(e)}), 500
 
 
 
+# ---------------------------------------------------------
+# BULK CREATE CUSTOMERS  (Requires Token)
+# ---------------------------------------------------------
+@customers_bp.route("/bulk", methods=["POST"])
+@token_required
+def add_customers_bulk(customer_id):
+    try:
+        # Creating accounts for others is a staff task, not something any customer may do
+        if int(customer_id) not in current_app.config["BULK_IMPORT_CUSTOMER_IDS"]:
+            return jsonify({"error": "Not allowed to bulk create customers"}), 403
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a JSON array of customers"}), 400
+        if len(data) > MAX_BULK_CUSTOMERS:
+            return jsonify({"error": f"At most {MAX_BULK_CUSTOMERS} customers per request"}), 400
+
+        # Validate every row in one pass; errors come back keyed by row index
+        errors = bulk_customers_schema.validate(data)
+        valid_indexes = [i for i in range(len(data)) if i not in errors]
+        rows = dict(zip(valid_indexes, bulk_customers_schema.load([data[i] for i in valid_indexes])))
+
+        # Check every email against the table with one IN query; within the batch the first row wins
+        emails = {row["email"] for row in rows.values()}
+        taken = set(db.session.scalars(
+            select(Customer.email).where(Customer.email.in_(emails))
+        )) if emails else set()
+        for i, row in list(rows.items()):
+            if row["email"] in taken:
+                errors[i] = {"email": ["Customer with this email already exists"]}
+                del rows[i]
+            else:
+                taken.add(row["email"])
+
+        created = {}
+        if rows:
+            indexes = list(rows)
+            # Only rows that will be inserted are hashed, spread over the hashing pool
+            password_hashes = password_hasher().hash_many([rows[i]["password"] for i in indexes])
+            customer_ids = insert_returning_ids(Customer, [
+                {
+                    "name": rows[i]["name"],
+                    "email": rows[i]["email"],
+                    "address": rows[i]["address"],
+                    "phone": rows[i]["phone"],
+                    "password_hash": password_hash
+                }
+                for i, password_hash in zip(indexes, password_hashes)
+            ])
+            created = dict(zip(indexes, customer_ids))
+
+            # Core inserts bypass the unit of work, so report what they touched
+            mark_stale("customers")
+            db.session.commit()
+
+        results = [
+            {"index": i, "status": "created", "customer_id": created[i]} if i in created
+            else {"index": i, "status": "rejected", "errors": errors[i]}
+            for i in range(len(data))
+        ]
+        status = 201 if not errors else 207 if created else 400
+        return jsonify({
+            "message": f"{len(created)} customers created, {len(errors)} rejected",
+            "created": len(created),
+            "rejected": len(errors),
+            "results": results
+        }), status
+
+    except IntegrityError:
+        # An email registered between the check and the insert
+        db.session.rollback()
+        return jsonify({"error": "Database integrity error"}), 409
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return _busy(e)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+
 # ---------------------------------------------------------
 # GET ALL CUSTOMERS  
 # ---------------------------------------------------------
@@ -57,7 +153,9 @@ def get_customers():
         per_page = request.args.get("per_page", 10, type=int)
 
         # Query customers with pagination
-        customers = Customer.query.paginate(page=page, per_page=per_page, error_out=False)
+        customers = Customer.query.options(*eager_load(customers_schema)).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
         # Serialize the customers
         result = {
@@ -80,7 +178,7 @@ def get_customers():
 @customers_bp.route("/<int:customer_id>", methods=["GET"])
 def get_customer(customer_id):
     try:
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id, options=eager_load(customer_schema))
         if not customer:
             return jsonify({"message": "Customer not found"}), 404
 
@@ -90,23 +188,52 @@ def get_customer(customer_id):
 
 
 
+# ---------------------------------------------------------
+# CUSTOMER SUMMARY  (visits, parts cost, mechanics seen)
+# ---------------------------------------------------------
+@customers_bp.route("/<int:customer_id>/summary", methods=["GET"])
+# The customer's row tag moves with every change to their tickets, links and parts;
+# prices and mechanic names are joined in, so any inventory or mechanic write counts too
+@cached_view("customers:{customer_id}", "inventory", "mechanics")
+def get_customer_summary(customer_id):
+    try:
+        top = request.args.get("top", SUMMARY_DEFAULT_TOP, type=int)
+        if top is None or not 1 <= top <= SUMMARY_MAX_TOP:
+            return jsonify({"error": f"top must be between 1 and {SUMMARY_MAX_TOP}"}), 400
+
+        summary = customer_summary(customer_id, top)
+        if summary is None:
+            return jsonify({"error": "Customer not found"}), 404
+
+        return jsonify(summary), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
 # ---------------------------------------------------------
 # DELETE CUSTOMER  (Requires Token)
 # ---------------------------------------------------------
 @customers_bp.route("/<int:customer_id>", methods=["DELETE"])
 @token_required
-def delete_customer(customer_id):
+def delete_customer(token_customer_id, customer_id):
     try:
-        customer = Customer.query.get(customer_id)
-        if not customer:
+        # The delete cascades to every ticket, so customers may only delete themselves
+        if str(token_customer_id) != str(customer_id):
+            return jsonify({"error": "Customers may only delete their own account"}), 403
+
+        # One DELETE; the database cascades to the tickets and their links
+        tickets_deleted(ServiceTicket.customer_id == customer_id)
+        if not delete_row(Customer, customer_id):
+            db.session.rollback()
             return jsonify({"message": "Customer not found"}), 404
-
-        db.session.delete(customer)
         db.session.commit()
 
         return jsonify({"message": "Customer deleted successfully"}), 200
 
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
@@ -125,7 +252,7 @@ def update_customer(customer_id):
             return jsonify({"error": "Customer not found"}), 404
 
         for key, value in data.items():
-            if hasattr(customer, key):
+            if key != "version" and hasattr(customer, key):
                 setattr(customer, key, value)
 
         db.session.commit()
@@ -160,6 +287,14 @@ def login():
         if not customer or not customer.check_password(password):  # Use check_password method
             return jsonify({'message': 'Invalid email or password'}), 401
 
+        # Hash parameters changed since this password was stored: upgrade it now
+        if customer.password_needs_rehash():
+            try:
+                customer.set_password(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                db.session.rollback()  # Retried on a later login
+
         # Generate a token for the customer
         token = encode_token(customer.customer_id)
 
@@ -168,10 +303,39 @@ def login():
             'token': token
         }), 200
 
+    except PasswordHasherBusy as e:
+        return _busy(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _busy(e):
+    return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
+
+
+# ---------------------------------------------------------
+# LOGOUT — Revokes the presented JWT before it expires
+# ---------------------------------------------------------
+@customers_bp.route('/logout', methods=['POST'])
+@token_required
+def logout(customer_id):
+    try:
+        claims = g.token_claims
+        key = token_key(bearer_token())
+        expires_at = datetime.utcfromtimestamp(claims["exp"]) if "exp" in claims else datetime.max
+
+        revoked_tokens().add(token_id(claims, key), expires_at)
+        db.session.commit()
+        token_cache().discard(key)
+
+        return jsonify({'message': 'Logged out successfully'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 
 # ---------------------------------------------------------
 # PROFILE — Uses customer_id from decoded JWT
@@ -182,7 +346,7 @@ def get_profile():
     try:
         customer_id = request.customer_id
 
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id, options=eager_load(customer_schema))
         if not customer:
             return jsonify({"error": "Customer not found"}), 404
 
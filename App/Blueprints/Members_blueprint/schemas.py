@@ -1,6 +1,6 @@
 from App.extensions import ma
 from App.models import Customer, ServiceTicket, Mechanics
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 # SCHEMAS
 
@@ -9,17 +9,31 @@ class CustomerSchema(ma.SQLAlchemyAutoSchema):
         model = Customer
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
         exclude = ("password_hash",)  # Exclude password_hash from serialization
 
     # Add a password field for input validation
     password = fields.String(load_only=True)
 
 
+class BulkCustomerSchema(Schema):
+    """
+    One row of a POST /customers/bulk payload. Plain schema: rows are
+    validated as dicts and inserted set-based, never turned into ORM instances.
+    """
+    name = fields.String(required=True, validate=validate.Length(min=1, max=255))
+    email = fields.Email(required=True, validate=validate.Length(max=255))
+    address = fields.String(required=True, validate=validate.Length(max=255))
+    phone = fields.String(required=True, validate=validate.Length(max=20))
+    password = fields.String(required=True, validate=validate.Length(min=1))
+
+
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = ServiceTicket
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
 
 class MechanicSchema(ma.SQLAlchemyAutoSchema):
@@ -27,6 +41,7 @@ class MechanicSchema(ma.SQLAlchemyAutoSchema):
         model = Mechanics
         include_relationships = True
         load_instance = True
+        dump_only = ("ticket_count", "version")
         
 class LoginSchema(Schema):
         email = fields.Email(required=True)
@@ -35,4 +50,5 @@ class LoginSchema(Schema):
 
 customer_schema = CustomerSchema()
 customers_schema = CustomerSchema(many=True)
-login_schema = LoginSchema()
\ No newline at end of file
+login_schema = LoginSchema()
+bulk_customers_schema = BulkCustomerSchema(many=True)
\ No newline at end of file
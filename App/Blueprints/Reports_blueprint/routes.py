@@ -0,0 +1,24 @@
+from flask import request, jsonify
+from App.utils.cache_tags import cached_view
+from App.utils.labour import labour_cost_report
+from App.utils.periods import parse_period
+from . import reports_bp
+
+
+# ROUTES — REPORTS
+
+# GET labour cost per month, mechanic and ticket
+@reports_bp.route("/labour-cost", methods=["GET"])
+@cached_view("mechanics", "service_ticket", "service_mechanics")
+def get_labour_cost():
+    try:
+        period = request.args.get("period")
+        try:
+            bounds = parse_period(period)
+        except ValueError:
+            return jsonify({"error": "period must be YYYY or YYYY-MM"}), 400
+
+        report = labour_cost_report(*(bounds or ()))
+        return jsonify({"period": period, **report}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,15 +1,43 @@
-from flask import request, jsonify, Blueprint
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from flask import request, jsonify, Blueprint, Response, stream_with_context
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
+from marshmallow import fields
 from marshmallow.exceptions import ValidationError
-from App.models import ServiceTicket, Mechanics
-from App.extensions import db, limiter, cache
+from App.models import ServiceTicket, Mechanics, Inventory, Customer, service_mechanics, inventory_tickets
+from App.extensions import db, limiter
 from App.utils.util import token_required
-from .schemas import service_tickets_schema, service_ticket_schema, mechanic_schema, mechanics_schema
+from App.utils.pagination import InvalidCursor, get_limit, keyset_page
+from App.utils.loading import eager_load
+from App.utils.junctions import existing_mechanic_ids, link_mechanics, link_pairs, unlink_mechanics
+from App.utils.search import search_terms, ticket_search_statement
+from App.utils.cache_tags import cached_view, mark_stale
+from App.utils.changelog import log_changes
+from App.utils.counters import count_links
+from App.utils.deletes import tickets_deleted
+from App.utils.versioning import conditional, row_etag, touch_rows
+from App.utils.stock import release_stock, reserve_stock
+from App.utils.upserts import insert_returning_ids
+from App.utils.scheduling import workload_scheduler
+from .schemas import (
+    service_tickets_schema, service_ticket_schema, mechanic_schema, mechanics_schema,
+    bulk_service_tickets_schema, stock_move_schema
+)
 
 # Define the Blueprint for service tickets
 service_tickets_bp = Blueprint('service_tickets', __name__)
 mechanics_bp = Blueprint('mechanics', __name__)
 
+MAX_BULK_TICKETS = 5000
+EXPORT_CHUNK_SIZE = 1000
+AUTO_ASSIGN_DEFAULT_BATCH = 500
+AUTO_ASSIGN_MAX_BATCH = 5000
+EXPORT_COLUMNS = ["ticket_id", "description", "date", "customer_id", "mechanic_ids", "inventory_ids"]
+
 
 # ROUTES — SERVICE TICKETS CRUD
 
@@ -41,23 +69,118 @@ def add_service_ticket(customer_id):
         return jsonify({"error": str(e)}), 500
 
 
+# BULK CREATE SERVICE TICKETS
+@service_tickets_bp.route("/bulk", methods=["POST"])
+@token_required
+def add_service_tickets_bulk(customer_id):
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a JSON array of service tickets"}), 400
+        if len(data) > MAX_BULK_TICKETS:
+            return jsonify({"error": f"At most {MAX_BULK_TICKETS} tickets per request"}), 400
+
+        # Validate every row in one pass; errors come back keyed by row index
+        errors = bulk_service_tickets_schema.validate(data)
+        valid_indexes = [i for i in range(len(data)) if i not in errors]
+        rows = dict(zip(valid_indexes, bulk_service_tickets_schema.load([data[i] for i in valid_indexes])))
+
+        # Resolve every referenced mechanic and inventory id with one IN query each
+        mechanic_ids = {m for row in rows.values() for m in row["mechanic_ids"]}
+        inventory_ids = {item for row in rows.values() for item in row["inventory_ids"]}
+        known_mechanics = set(db.session.scalars(
+            select(Mechanics.mechanic_id).where(Mechanics.mechanic_id.in_(mechanic_ids))
+        )) if mechanic_ids else set()
+        known_items = set(db.session.scalars(
+            select(Inventory.item_id).where(Inventory.item_id.in_(inventory_ids))
+        )) if inventory_ids else set()
+
+        for i, row in list(rows.items()):
+            row_errors = {}
+            missing_mechanics = sorted(set(row["mechanic_ids"]) - known_mechanics)
+            missing_items = sorted(set(row["inventory_ids"]) - known_items)
+            if missing_mechanics:
+                row_errors["mechanic_ids"] = [f"Unknown mechanic ids: {missing_mechanics}"]
+            if missing_items:
+                row_errors["inventory_ids"] = [f"Unknown inventory ids: {missing_items}"]
+            if row_errors:
+                errors[i] = row_errors
+                del rows[i]
+
+        created = {}
+        if rows:
+            now = datetime.utcnow()
+            indexes = list(rows)
+            ticket_ids = insert_returning_ids(ServiceTicket, [
+                {
+                    "description": rows[i]["description"],
+                    "date": rows[i]["date"] or now,
+                    "customer_id": int(customer_id)
+                }
+                for i in indexes
+            ])
+            created = dict(zip(indexes, ticket_ids))
+            ticket_dates = {created[i]: rows[i]["date"] or now for i in indexes}
+
+            mechanic_links = [
+                {"ticket_id": created[i], "mechanic_id": mechanic_id}
+                for i in indexes for mechanic_id in dict.fromkeys(rows[i]["mechanic_ids"])
+            ]
+            inventory_links = [
+                {"ticket_id": created[i], "item_id": item_id}
+                for i in indexes for item_id in dict.fromkeys(rows[i]["inventory_ids"])
+            ]
+            if mechanic_links:
+                db.session.execute(insert(service_mechanics), mechanic_links)
+            if inventory_links:
+                db.session.execute(insert(inventory_tickets), inventory_links)
+
+            # Core inserts bypass the unit of work, so report what they touched
+            mark_stale("service_ticket", "service_mechanics", "inventory_tickets")
+            touch_rows(Customer, [int(customer_id)])
+            touch_rows(Mechanics, {link["mechanic_id"] for link in mechanic_links})
+            touch_rows(Inventory, {link["item_id"] for link in inventory_links})
+            log_changes(ServiceTicket.__table__, ticket_ids, "insert")
+            log_changes(service_mechanics, [(link["ticket_id"], link["mechanic_id"]) for link in mechanic_links], "insert")
+            log_changes(inventory_tickets, [(link["ticket_id"], link["item_id"]) for link in inventory_links], "insert")
+            count_links([(link["mechanic_id"], ticket_dates[link["ticket_id"]]) for link in mechanic_links], 1)
+            db.session.commit()
+
+        results = [
+            {"index": i, "status": "created", "ticket_id": created[i]} if i in created
+            else {"index": i, "status": "rejected", "errors": errors[i]}
+            for i in range(len(data))
+        ]
+        status = 201 if not errors else 207 if created else 400
+        return jsonify({
+            "message": f"{len(created)} service tickets created, {len(errors)} rejected",
+            "created": len(created),
+            "rejected": len(errors),
+            "results": results
+        }), status
+
+    except IntegrityError:
+        # A referenced row deleted between the check and the insert
+        db.session.rollback()
+        return jsonify({"error": "Database integrity error"}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 # ASSIGN MECHANIC TO SERVICE TICKET
 @service_tickets_bp.route("/<int:ticket_id>/assign-mechanic/<int:mechanic_id>", methods=["PUT"])
 def assign_mechanic(ticket_id, mechanic_id):
     try:
-        # Fetch the service ticket and mechanic
+        # Fetch the service ticket
         service_ticket = ServiceTicket.query.get(ticket_id)
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
-        mechanic = Mechanics.query.get(mechanic_id)
 
-        if not mechanic:
+        # Assign the mechanic with a single insert-or-ignore on the junction table
+        if not link_mechanics(ticket_id, [mechanic_id]):
             return jsonify({"error": "Mechanic not found"}), 404
-
-        # Assign the mechanic to the service ticket
-        if mechanic not in service_ticket.mechanics:
-            service_ticket.mechanics.append(mechanic)
-            db.session.commit()
+        db.session.commit()
 
         return jsonify({
             "message": "Mechanic assigned to service ticket successfully",
@@ -65,6 +188,7 @@ def assign_mechanic(ticket_id, mechanic_id):
         }), 200
 
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
@@ -72,31 +196,96 @@ def assign_mechanic(ticket_id, mechanic_id):
 @service_tickets_bp.route("/<int:ticket_id>/remove-mechanic/<int:mechanic_id>", methods=["PUT"])
 def remove_mechanic(ticket_id, mechanic_id):
     try:
-        # Fetch the service ticket and mechanic
+        # Fetch the service ticket and check the mechanic exists
         service_ticket = ServiceTicket.query.get(ticket_id)
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
-        mechanic = Mechanics.query.get(mechanic_id)
+        if not existing_mechanic_ids([mechanic_id]):
+            return jsonify({"error": "Mechanic not found"}), 404
+
+        # Remove the mechanic with a single delete on the junction table
+        unlink_mechanics(ticket_id, [mechanic_id])
+        db.session.commit()
+
+        return jsonify({
+            "message": "Mechanic removed from service ticket successfully",
+            "data": service_ticket_schema.dump(service_ticket)
+        }), 200
 
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+# AUTO-ASSIGN THE LEAST-LOADED MECHANIC TO A SERVICE TICKET
+@service_tickets_bp.route("/<int:ticket_id>/auto-assign", methods=["POST"])
+def auto_assign_mechanic(ticket_id):
+    try:
+        service_ticket = db.session.get(ServiceTicket, ticket_id)
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
-        if not mechanic:
-            return jsonify({"error": "Mechanic not found"}), 404
 
-        # Remove the mechanic from the service ticket
-        if mechanic in service_ticket.mechanics:
-            service_ticket.mechanics.remove(mechanic)
-            db.session.commit()
+        # Never pick a mechanic who is already on the ticket
+        assigned = _linked_ids(service_mechanics, service_mechanics.c.mechanic_id, [ticket_id])[ticket_id]
+        assignments = _commit_assignments([ticket_id], exclude=set(assigned))
+        if not assignments:
+            return jsonify({"error": "No mechanic available"}), 409
 
         return jsonify({
-            "message": "Mechanic removed from service ticket successfully",
+            "message": "Mechanic assigned to service ticket successfully",
+            "mechanic_id": assignments[ticket_id],
             "data": service_ticket_schema.dump(service_ticket)
         }), 200
 
     except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+# AUTO-ASSIGN THE BACKLOG OF UNASSIGNED SERVICE TICKETS
+@service_tickets_bp.route("/auto-assign", methods=["POST"])
+def auto_assign_backlog():
+    try:
+        # Oldest first; NOT EXISTS probes the junction's primary key
+        limit = get_limit(AUTO_ASSIGN_DEFAULT_BATCH, AUTO_ASSIGN_MAX_BATCH)
+        ticket_ids = db.session.scalars(
+            select(ServiceTicket.ticket_id)
+            .where(~select(service_mechanics.c.ticket_id)
+                   .where(service_mechanics.c.ticket_id == ServiceTicket.ticket_id).exists())
+            .order_by(ServiceTicket.date, ServiceTicket.ticket_id)
+            .limit(limit)
+        ).all()
+        assignments = _commit_assignments(ticket_ids)
+
+        return jsonify({
+            "message": f"{len(assignments)} service tickets assigned",
+            "assigned": [
+                {"ticket_id": ticket_id, "mechanic_id": mechanic_id}
+                for ticket_id, mechanic_id in assignments.items()
+            ],
+            "unassigned": len(ticket_ids) - len(assignments)
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+def _commit_assignments(ticket_ids, exclude=()):
+    """
+    Pick mechanics from the workload heap and insert every link at once.
+    """
+    scheduler = workload_scheduler()
+    assignments = scheduler.assign(ticket_ids, exclude)
+    try:
+        link_pairs(assignments.items())
+        db.session.commit()
+    except Exception:
+        scheduler.forget()
+        raise
+    return assignments
+
+
 # EDIT MECHANICS IN SERVICE TICKET
 @service_tickets_bp.route("/<int:ticket_id>/edit", methods=["PUT"])
 def edit_mechanics(ticket_id):
@@ -110,17 +299,9 @@ def edit_mechanics(ticket_id):
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
 
-        # Add mechanics to the ticket
-        for mechanic_id in add_ids:
-            mechanic = Mechanics.query.get(mechanic_id)
-            if mechanic and mechanic not in service_ticket.mechanics:
-                service_ticket.mechanics.append(mechanic)
-
-        # Remove mechanics from the ticket
-        for mechanic_id in remove_ids:
-            mechanic = Mechanics.query.get(mechanic_id)
-            if mechanic and mechanic in service_ticket.mechanics:
-                service_ticket.mechanics.remove(mechanic)
+        # Apply the whole change set as one DELETE and one INSERT; unknown ids are skipped
+        unlink_mechanics(ticket_id, remove_ids)
+        link_mechanics(ticket_id, set(add_ids) - set(remove_ids))
 
         # Commit changes to the database
         db.session.commit()
@@ -131,28 +312,217 @@ def edit_mechanics(ticket_id):
         }), 200
 
     except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+# RESERVE INVENTORY FOR SERVICE TICKET
+@service_tickets_bp.route("/<int:ticket_id>/inventory/<int:item_id>/reserve", methods=["POST"])
+def reserve_inventory(ticket_id, item_id):
+    try:
+        quantity = stock_move_schema.load(request.get_json() or {})["quantity"]
+        error = _missing_ticket_or_item(ticket_id, item_id)
+        if error:
+            return error
+
+        # One conditional UPDATE both checks and takes the stock
+        if not reserve_stock(ticket_id, item_id, quantity):
+            db.session.rollback()
+            return jsonify({"error": "Insufficient stock"}), 409
+        db.session.commit()
+
+        return jsonify({"message": f"Reserved {quantity} units", **_stock_line(ticket_id, item_id)}), 200
+
+    except ValidationError as err:
+        return jsonify({"error": err.messages}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+# RELEASE INVENTORY FROM SERVICE TICKET
+@service_tickets_bp.route("/<int:ticket_id>/inventory/<int:item_id>/release", methods=["POST"])
+def release_inventory(ticket_id, item_id):
+    try:
+        quantity = stock_move_schema.load(request.get_json() or {})["quantity"]
+        error = _missing_ticket_or_item(ticket_id, item_id)
+        if error:
+            return error
+
+        if not release_stock(ticket_id, item_id, quantity):
+            db.session.rollback()
+            return jsonify({"error": "Ticket does not hold that many units"}), 409
+        db.session.commit()
+
+        return jsonify({"message": f"Released {quantity} units", **_stock_line(ticket_id, item_id)}), 200
+
+    except ValidationError as err:
+        return jsonify({"error": err.messages}), 400
+    except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+def _missing_ticket_or_item(ticket_id, item_id):
+    if db.session.get(ServiceTicket, ticket_id) is None:
+        return jsonify({"error": "Service ticket not found"}), 404
+    if db.session.get(Inventory, item_id) is None:
+        return jsonify({"error": "Inventory item not found"}), 404
+    return None
+
+
+def _stock_line(ticket_id, item_id):
+    reserved = db.session.scalar(
+        select(inventory_tickets.c.quantity).where(
+            inventory_tickets.c.ticket_id == ticket_id, inventory_tickets.c.item_id == item_id
+        )
+    )
+    in_stock = db.session.scalar(select(Inventory.quantity).where(Inventory.item_id == item_id))
+    return {"ticket_id": ticket_id, "item_id": item_id, "reserved": reserved or 0, "in_stock": in_stock}
+
+
 # GET all service tickets
 @service_tickets_bp.route("/", methods=["GET"])
 @limiter.limit("10 per minute")
-@cache.cached(timeout=60)  # Cache the response for 60 seconds
+@cached_view("service_ticket", "service_mechanics", "inventory_tickets")
 def get_service_tickets():
     try:
-        all_service_tickets = ServiceTicket.query.all()
-        return jsonify(service_tickets_schema.dump(all_service_tickets)), 200
+        # Keyset pagination ordered by (date, ticket_id)
+        service_tickets, next_cursor = keyset_page(
+            ServiceTicket.query.options(*eager_load(service_tickets_schema)),
+            [ServiceTicket.date, ServiceTicket.ticket_id],
+            after=request.args.get("after"),
+            limit=get_limit()
+        )
+        return jsonify({
+            "tickets": service_tickets_schema.dump(service_tickets),
+            "next_cursor": next_cursor
+        }), 200
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# SEARCH service tickets by description (ranked, paginated)
+@service_tickets_bp.route("/search", methods=["GET"])
+def search_service_tickets():
+    try:
+        terms = search_terms(request.args.get("q"))
+        if not terms:
+            return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+        page = request.args.get("page", 1, type=int)
+        per_page = request.args.get("per_page", 10, type=int)
+
+        stmt = ticket_search_statement(terms).options(*eager_load(service_tickets_schema))
+        results = db.paginate(stmt, page=page, per_page=per_page, error_out=False)
+
+        return jsonify({
+            "tickets": service_tickets_schema.dump(results.items),
+            "total": results.total,
+            "pages": results.pages,
+            "current_page": results.page
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# EXPORT service tickets as a stream (NDJSON or CSV)
+@service_tickets_bp.route("/export", methods=["GET"])
+def export_service_tickets():
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+
+    try:
+        date_from = _parse_date_arg("from")
+        date_to = _parse_date_arg("to")
+    except ValueError:
+        return jsonify({"error": "from/to must be ISO 8601 dates"}), 400
+
+    # Half-open range [from, to) so consecutive month-end pulls never overlap
+    stmt = select(
+        ServiceTicket.ticket_id, ServiceTicket.description, ServiceTicket.date, ServiceTicket.customer_id
+    ).order_by(ServiceTicket.date, ServiceTicket.ticket_id)
+    if date_from:
+        stmt = stmt.where(ServiceTicket.date >= date_from)
+    if date_to:
+        stmt = stmt.where(ServiceTicket.date < date_to)
+
+    def generate():
+        if export_format == "csv":
+            yield ",".join(EXPORT_COLUMNS) + "\r\n"
+
+        # Server-side cursor on its own connection; junction lookups use the session
+        with db.engine.connect() as connection:
+            result = connection.execution_options(yield_per=EXPORT_CHUNK_SIZE).execute(stmt)
+            for chunk in result.partitions():
+                ticket_ids = [row.ticket_id for row in chunk]
+                mechanic_ids = _linked_ids(service_mechanics, service_mechanics.c.mechanic_id, ticket_ids)
+                inventory_ids = _linked_ids(inventory_tickets, inventory_tickets.c.item_id, ticket_ids)
+                rows = [
+                    {
+                        "ticket_id": row.ticket_id,
+                        "description": row.description,
+                        "date": row.date.isoformat() if row.date else None,
+                        "customer_id": row.customer_id,
+                        "mechanic_ids": mechanic_ids.get(row.ticket_id, []),
+                        "inventory_ids": inventory_ids.get(row.ticket_id, [])
+                    }
+                    for row in chunk
+                ]
+                yield _ndjson_chunk(rows) if export_format == "ndjson" else _csv_chunk(rows)
+
+    mimetype = "application/x-ndjson" if export_format == "ndjson" else "text/csv"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=service_tickets.{export_format}"}
+    )
+
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    return datetime.fromisoformat(value) if value else None
+
+
+def _linked_ids(table, column, ticket_ids):
+    """
+    Map each ticket id in the chunk to its linked ids with one IN query.
+    """
+    linked = defaultdict(list)
+    rows = db.session.execute(
+        select(table.c.ticket_id, column).where(table.c.ticket_id.in_(ticket_ids)).order_by(column)
+    )
+    for ticket_id, linked_id in rows:
+        linked[ticket_id].append(linked_id)
+    return linked
+
+
+def _ndjson_chunk(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row["ticket_id"], row["description"], row["date"], row["customer_id"],
+            ";".join(map(str, row["mechanic_ids"])), ";".join(map(str, row["inventory_ids"]))
+        ])
+    return buffer.getvalue()
+
+
 # GET a single service ticket
 @service_tickets_bp.route("/<int:ticket_id>", methods=["GET"])
 @limiter.limit("10 per minute")
-@cache.cached(timeout=60)  # Cache the response for 60 seconds
+@conditional(lambda ticket_id: row_etag(ServiceTicket, ticket_id))
+@cached_view("service_ticket:{ticket_id}", "service_ticket:*")
 def get_service_ticket(ticket_id):
     try:
-        service_ticket = ServiceTicket.query.get(ticket_id)
+        service_ticket = db.session.get(ServiceTicket, ticket_id, options=eager_load(service_ticket_schema))
         if not service_ticket:
             return jsonify({"message": "Service ticket not found"}), 404
 
@@ -166,15 +536,27 @@ def get_service_ticket(ticket_id):
 @token_required
 def get_my_tickets(customer_id):
     try:
-        # Query service tickets for the authenticated customer
-        service_tickets = ServiceTicket.query.filter_by(customer_id=customer_id).all()
+        after = request.args.get("after")
+
+        # Query one page of service tickets for the authenticated customer
+        service_tickets, next_cursor = keyset_page(
+            ServiceTicket.query.filter_by(customer_id=customer_id).options(*eager_load(service_tickets_schema)),
+            [ServiceTicket.date, ServiceTicket.ticket_id],
+            after=after,
+            limit=get_limit()
+        )
 
-        if not service_tickets:
+        if not service_tickets and not after:
             return jsonify({"message": "No service tickets found for this customer"}), 404
 
         # Serialize and return the service tickets
-        return jsonify(service_tickets_schema.dump(service_tickets)), 200
+        return jsonify({
+            "tickets": service_tickets_schema.dump(service_tickets),
+            "next_cursor": next_cursor
+        }), 200
 
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -183,15 +565,16 @@ def get_my_tickets(customer_id):
 @service_tickets_bp.route("/<int:ticket_id>", methods=["DELETE"])
 def delete_service_ticket(ticket_id):
     try:
-        service_ticket = ServiceTicket.query.get(ticket_id)
-        if not service_ticket:
+        # One DELETE; the database cascades to the ticket's links. tickets_deleted
+        # has already logged and invalidated it, so the DELETE itself is plain
+        if not tickets_deleted(ServiceTicket.ticket_id == ticket_id):
             return jsonify({"message": "Service ticket not found"}), 404
-
-        db.session.delete(service_ticket)
+        db.session.execute(delete(ServiceTicket.__table__).where(ServiceTicket.ticket_id == ticket_id))
         db.session.commit()
 
         return jsonify({"message": "Service ticket deleted successfully"}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
@@ -207,9 +590,13 @@ def update_service_ticket(ticket_id):
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
 
+        # Dates arrive as ISO strings; the column and the monthly rollups need a datetime
+        if data.get("date") is not None:
+            data["date"] = fields.DateTime().deserialize(data["date"], "date", data)
+
         # Update fields
         for key, value in data.items():
-            if hasattr(service_ticket, key):
+            if key != "version" and hasattr(service_ticket, key):
                 setattr(service_ticket, key, value)
 
         db.session.commit()
@@ -1,13 +1,14 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from App.extensions import ma, db
 from App.models import ServiceTicket, Mechanics
-from marshmallow import fields
+from marshmallow import Schema, fields, validate
 
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = ServiceTicket
         include_relationships = True
         load_instance = True
+        dump_only = ("version",)
 
     # Explicitly include the customer_id field for input validation
     customer_id = fields.Integer(required=True)
@@ -15,11 +16,29 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     # Exclude the customer relationship from input validation
     customer = ma.auto_field(dump_only=True)
 
+class BulkServiceTicketSchema(Schema):
+    """
+    One row of a POST /tickets/bulk payload. Plain schema: rows are validated
+    as dicts and inserted set-based, never turned into ORM instances.
+    """
+    description = fields.String(required=True, validate=validate.Length(min=1, max=255))
+    date = fields.DateTime(load_default=None)
+    mechanic_ids = fields.List(fields.Integer(), load_default=list)
+    inventory_ids = fields.List(fields.Integer(), load_default=list)
+
+class StockMoveSchema(Schema):
+    """
+    Body of a reserve/release request: how many units to move.
+    """
+    quantity = fields.Integer(required=True, validate=validate.Range(min=1))
+
 class ServiceMechanicSchema(ma.SQLAlchemyAutoSchema):  # Renamed to avoid conflict
     class Meta:
         model = Mechanics
         include_relationships = True
         load_instance = True
+        dump_only = ("ticket_count", "version")
+        exclude = ("tickets",)
 
 mechanic_schema = ServiceMechanicSchema()
 mechanics_schema = ServiceMechanicSchema(many=True)
@@ -27,5 +46,9 @@ mechanics_schema = ServiceMechanicSchema(many=True)
 service_ticket_schema = ServiceTicketSchema()
 service_tickets_schema = ServiceTicketSchema(many=True)
 
+bulk_service_tickets_schema = BulkServiceTicketSchema(many=True)
+
+stock_move_schema = StockMoveSchema()
+
 
 
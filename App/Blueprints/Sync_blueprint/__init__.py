@@ -0,0 +1,5 @@
+from flask import Blueprint
+
+sync_bp = Blueprint('sync_bp', __name__)
+
+from . import routes
\ No newline at end of file
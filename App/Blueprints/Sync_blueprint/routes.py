@@ -0,0 +1,34 @@
+from flask import request, jsonify
+from App.models import ChangeLog
+from App.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, get_limit
+from App.utils.changelog import ResyncRequired, changes_since
+from . import sync_bp
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 5000
+
+
+# ROUTES — INCREMENTAL SYNC
+
+# GET changes since a sync token
+@sync_bp.route("/", methods=["GET"])
+def get_changes():
+    try:
+        since = request.args.get("since")
+        since = decode_cursor(since, [ChangeLog.change_id])[0] if since else 0
+
+        changes, last_change_id, has_more = changes_since(
+            since, get_limit(default=SYNC_DEFAULT_LIMIT, maximum=SYNC_MAX_LIMIT)
+        )
+        return jsonify({
+            "changes": changes,
+            "next": encode_cursor(last_change_id),
+            "has_more": has_more
+        }), 200
+
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except ResyncRequired as e:
+        return jsonify({"error": str(e)}), 410
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -2,10 +2,17 @@ from flask import Flask, app
 import os  # Import the os module
 from App.Blueprints.Inventory.routes import inventory_bp  # Import the inventory blueprint
 from App.extensions import db, ma, limiter, cache
-from App.config import DevelopmentConfig, ProductionConfig
+from App.models import create_search_index
+from App.utils.changelog import compact_change_log
+from App.utils.counters import rebuild_ticket_counters
+from App.utils.engine import configure_engine
+from App.utils.migrations import upgrade_schema
+from App.config import DevelopmentConfig, ProductionConfig, TestingConfig
 from App.Blueprints.Service_Ticket_blueprint.routes import service_tickets_bp
 from App.Blueprints.Mechanic_blueprint.routes import mechanics_bp
 from App.Blueprints.Members_blueprint.routes import customers_bp
+from App.Blueprints.Sync_blueprint.routes import sync_bp
+from App.Blueprints.Reports_blueprint.routes import reports_bp
 from flask_swagger_ui import get_swaggerui_blueprint
 
 SWAGGER_URL = '/api/docs'  # URL for exposing Swagger UI (without trailing '/')
@@ -21,24 +28,56 @@ swaggerui_blueprint = get_swaggerui_blueprint(
 
 def create_app(config_name):
     app = Flask(__name__)
-    if os.environ.get("RENDER") == "true":
+    if config_name == "testing":
+        app.config.from_object(TestingConfig)
+    elif os.environ.get("RENDER") == "true":
         app.config.from_object(ProductionConfig)
     else:
         app.config.from_object(DevelopmentConfig)
 
     # Initialize extensions
     db.init_app(app)
+    configure_engine(app)
     ma.init_app(app)
     limiter.init_app(app)
     cache.init_app(app)
+    if app.config.get("CACHE_CLEAR_ON_START"):
+        with app.app_context():
+            cache.clear()
 
     # Register blueprints
     app.register_blueprint(customers_bp, url_prefix="/customers")
     app.register_blueprint(mechanics_bp, url_prefix="/mechanics")
     app.register_blueprint(service_tickets_bp, url_prefix="/tickets")
     app.register_blueprint(inventory_bp, url_prefix="/inventory")  # Register inventory blueprint
+    app.register_blueprint(sync_bp, url_prefix="/sync")
+    app.register_blueprint(reports_bp, url_prefix="/reports")
     app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)  # Registering our swagger blueprint
 
+    @app.cli.command("create-search-index")
+    def create_search_index_command():
+        """Create or rebuild the service ticket full-text index."""
+        create_search_index()
+        print("Search index ready.")
+
+    @app.cli.command("compact-change-log")
+    def compact_change_log_command():
+        """Drop superseded sync log entries and expired tombstones."""
+        print(f"Removed {compact_change_log()} change log entries.")
+
+    @app.cli.command("rebuild-ticket-counters")
+    def rebuild_ticket_counters_command():
+        """Recompute mechanic ticket counters and monthly rollups."""
+        rebuild_ticket_counters()
+        print("Ticket counters rebuilt.")
+
+    @app.cli.command("upgrade-schema")
+    def upgrade_schema_command():
+        """Add tables, columns and indexes missing from an older database."""
+        for statement in upgrade_schema():
+            print(statement)
+        print("Schema up to date.")
+
     return app
 
 app = create_app('ProductionConfig')
\ No newline at end of file
@@ -1,20 +1,109 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 
 # Load environment variables from .env file
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def engine_options(uri):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI. Server databases (MySQL,
+    Postgres) get a sized pool whose connections are recycled before the
+    server or a proxy drops them, and checked with a ping on checkout.
+    SQLite opens local files, so it is tuned per connection instead
+    (SQLITE_PRAGMAS, applied by App/utils/engine.py).
+    """
+    if uri.startswith("sqlite"):
+        return {}
+    return {
+        # Per worker process: size for the worker's threads, times workers for the server
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        # Below MySQL's wait_timeout and typical load balancer idle timeouts
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "devkey")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Raise on any relationship that is lazy-loaded during serialization
+    STRICT_EAGER_LOADING = os.environ.get("STRICT_EAGER_LOADING") == "true"
+    # Tagged view caches are invalidated on commit, so they can live for hours
+    CACHE_VIEW_TIMEOUT = int(os.environ.get("CACHE_VIEW_TIMEOUT", 6 * 60 * 60))
+
+    # Two-tier cache: per-worker LRU (L1) in front of a store shared by all workers (L2)
+    CACHE_TYPE = "App.utils.cache_backends.TieredCache"
+    CACHE_L1_SIZE = int(os.environ.get("CACHE_L1_SIZE", 1024))
+    CACHE_L1_TIMEOUT = int(os.environ.get("CACHE_L1_TIMEOUT", 60))
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+    CACHE_L2_TYPE = "RedisCache" if CACHE_REDIS_URL else "FileSystemCache"
+    CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(BASE_DIR, "instance", "cache"))
+    CACHE_THRESHOLD = int(os.environ.get("CACHE_THRESHOLD", 10000))
+
+    # Deletes stay in the sync change log this long; older sync tokens must resync
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    # Outside SQLite, log readers wait this long for a skipped change_id to commit
+    SYNC_COMMIT_GRACE_SECONDS = float(os.environ.get("SYNC_COMMIT_GRACE_SECONDS", 10))
+
+    # Password hashing (werkzeug method string); changing it rehashes on next login
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", 16))
+    # Per worker process: hashes run at once, and how many more may wait before 503
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.environ.get("PASSWORD_HASH_QUEUE_DEPTH", 16))
+
+    # Verified JWT claims kept per worker, so repeat tokens skip decoding
+    TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 4096))
+    # How stale a worker's view of other workers' revocations may get, in seconds
+    TOKEN_REVOCATION_SYNC_SECONDS = float(os.environ.get("TOKEN_REVOCATION_SYNC_SECONDS", 1))
+
+    # Customers (comma-separated ids) whose token may call POST /customers/bulk; nobody by default
+    BULK_IMPORT_CUSTOMER_IDS = {
+        int(customer_id) for customer_id in os.environ.get("BULK_IMPORT_CUSTOMER_IDS", "").split(",")
+        if customer_id.strip()
+    }
+
+    # Run on every new SQLite connection. WAL lets readers run alongside the
+    # one writer, and with synchronous=NORMAL a commit no longer waits for an
+    # fsync (a power loss may drop the last commits, never corrupt the file).
+    # Writers wait busy_timeout ms for the lock instead of failing at once.
+    # SQLITE_TUNING=false keeps only foreign_keys, e.g. to benchmark against.
+    SQLITE_PRAGMAS = {
+        "foreign_keys": "ON",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", 64 * 1024)),  # negative: KiB, not pages
+    } if os.environ.get("SQLITE_TUNING", "true") == "true" else {"foreign_keys": "ON"}
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # The development database is recreated freely, so start from an empty cache
+    CACHE_CLEAR_ON_START = True
 
 class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("SQLALCHEMY_DATABASE_URI", "sqlite:///production.db")
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+class TestingConfig(DevelopmentConfig):
+    # Tests create and drop every table, so keep them off the tracked development.db.
+    # A file, not :memory:, so several apps in one run (one per "worker") share it.
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "TEST_DATABASE_URI", "sqlite:///" + os.path.join(tempfile.gettempdir(), "mymechanicshop-test.db")
+    )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "mymechanicshop-test-cache")
+    BULK_IMPORT_CUSTOMER_IDS = {1}
@@ -4,7 +4,7 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 
-cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})
+cache = Cache()  # Configured from app.config (see App/config.py)
 limiter = Limiter(key_func=get_remote_address)
 db = SQLAlchemy()
 ma = Marshmallow()
@@ -1,25 +1,39 @@
-from sqlalchemy import Table, Column, String, Float, DateTime, ForeignKey
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy import Table, Column, String, Float, Date, DateTime, ForeignKey, MetaData, Integer, Boolean, Computed, DDL, event, func, text
+from sqlalchemy.orm import relationship, Mapped, WriteOnlyMapped, mapped_column, column_property
 from datetime import datetime
 from typing import List
 from App.extensions import db  
-from werkzeug.security import generate_password_hash, check_password_hash
+from App.utils.passwords import password_hasher
 
 
 
+def version_column():
+    """
+    Row version for ETags: starts at 1 and is incremented by every UPDATE of
+    the row, ORM or Core, that does not set it explicitly.
+    """
+    return mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1"), onupdate=text("version + 1")
+    )
+
+
 # Junction Table
 service_mechanics = Table(
     "service_mechanics",
     db.metadata,
-    Column("ticket_id", ForeignKey("service_ticket.ticket_id"), primary_key=True),
-    Column("mechanic_id", ForeignKey("mechanics.mechanic_id"), primary_key=True)
+    Column("ticket_id", ForeignKey("service_ticket.ticket_id", ondelete="CASCADE"), primary_key=True),
+    Column("mechanic_id", ForeignKey("mechanics.mechanic_id", ondelete="CASCADE"), primary_key=True),
+    # A mechanic's tickets (GET /mechanics/<id>/tickets); the primary key leads with ticket_id
+    db.Index("ix_service_mechanics_mechanic_id_ticket_id", "mechanic_id", "ticket_id")
 )
 
 inventory_tickets = Table(
     "inventory_tickets",
     db.metadata,
-    Column("ticket_id", ForeignKey("service_ticket.ticket_id"), primary_key=True),
-    Column("item_id", ForeignKey("inventory.item_id"), primary_key=True)
+    Column("ticket_id", ForeignKey("service_ticket.ticket_id", ondelete="CASCADE"), primary_key=True),
+    Column("item_id", ForeignKey("inventory.item_id", ondelete="CASCADE"), primary_key=True),
+    # Units of the item reserved for the ticket (see App/utils/stock.py)
+    Column("quantity", Integer, nullable=False, default=0, server_default=text("0"))
 )
 
 class Customer(db.Model):
@@ -31,25 +45,38 @@ class Customer(db.Model):
     address: Mapped[str] = mapped_column(String(255), nullable=False)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    version: Mapped[int] = version_column()
     tickets: Mapped[List["ServiceTicket"]] = relationship(
     "ServiceTicket",
     back_populates="customer",
-    cascade="all, delete-orphan"
+    cascade="all, delete-orphan",
+    # The database deletes them (ON DELETE CASCADE); never load them just to delete
+    passive_deletes=True
 )
+    # Both run on the app's hashing pool and raise PasswordHasherBusy when it is full
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method="pbkdf2:sha256")
+        self.password_hash = password_hasher().hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher().needs_rehash(self.password_hash)
 
 
 class ServiceTicket(db.Model):
     __tablename__ = "service_ticket"
+    __table_args__ = (
+        # Keyset pagination indexes for GET /tickets/ and /tickets/my-tickets
+        db.Index("ix_service_ticket_date_ticket_id", "date", "ticket_id"),
+        db.Index("ix_service_ticket_customer_date_ticket_id", "customer_id", "date", "ticket_id"),
+    )
 
     ticket_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
     date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.customer_id"), nullable=False)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.customer_id", ondelete="CASCADE"), nullable=False)
+    version: Mapped[int] = version_column()
 
     # Relationship back to Customer
     customer: Mapped["Customer"] = relationship(
@@ -61,42 +88,187 @@ class ServiceTicket(db.Model):
     mechanics: Mapped[List["Mechanics"]] = relationship(
         "Mechanics",
         secondary=service_mechanics,
-        back_populates="tickets"
+        back_populates="tickets",
+        passive_deletes=True
     )
 
     # Define the inventory_items relationship
     inventory_items: Mapped[List["Inventory"]] = relationship(
         "Inventory",
         secondary=inventory_tickets,
-        back_populates="service_tickets"
+        back_populates="service_tickets",
+        passive_deletes=True
     )
 
 
 class Mechanics(db.Model):
     __tablename__ = "mechanics"
+    __table_args__ = (
+        # All-time leaderboard reads the top of this index
+        db.Index("ix_mechanics_ticket_count_mechanic_id", "ticket_count", "mechanic_id"),
+    )
 
     mechanic_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     address: Mapped[str] = mapped_column(String(255), nullable=False)
     salary: Mapped[float] = mapped_column(Float, nullable=False)
-#
-    tickets: Mapped[List["ServiceTicket"]] = relationship(
+    # Tickets linked through service_mechanics, maintained by App/utils/counters.py
+    ticket_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    version: Mapped[int] = version_column()
+    # Write-only: never loaded whole, page through GET /mechanics/<id>/tickets
+    tickets: WriteOnlyMapped["ServiceTicket"] = relationship(
         "ServiceTicket",
         secondary=service_mechanics,
-        back_populates="mechanics"
+        back_populates="mechanics",
+        # The collection can't be loaded to delete links: see unlink_tickets
+        passive_deletes=True
     )
 
 class Inventory(db.Model):
     __tablename__ = "inventory"
+    __table_args__ = (
+        # Keyset pagination indexes for each sort key of GET /inventory/
+        db.Index("ix_inventory_price_item_id", "price", "item_id"),
+        db.Index("ix_inventory_quantity_item_id", "quantity", "item_id"),
+        # The low-stock set, through an indexed flag rather than a partial index MySQL lacks
+        db.Index("ix_inventory_low_stock_item_id", "low_stock", "item_id"),
+    )
 
     item_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Supplier part number; the key that POST /inventory/import upserts on
+    sku: Mapped[str] = mapped_column(String(64), unique=True, nullable=True)
     item_name: Mapped[str] = mapped_column(String(255), nullable=False)
     quantity: Mapped[int] = mapped_column(db.Integer, nullable=False)
     price: Mapped[float] = mapped_column(Float, nullable=False)
+    reorder_point: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Kept by the database on every write, including Core upserts
+    low_stock: Mapped[bool] = mapped_column(Boolean, Computed("quantity <= reorder_point", persisted=True))
+    version: Mapped[int] = version_column()
+
+    # Case-insensitive name for prefix search and sorting, computed by the database
+    name_key: Mapped[str] = column_property(func.lower(item_name, type_=String))
 
     # Define the service_tickets relationship
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         "ServiceTicket",
         secondary=inventory_tickets,
-        back_populates="inventory_items"
-    )
\ No newline at end of file
+        back_populates="inventory_items",
+        passive_deletes=True
+    )
+
+
+# Expression index backing Inventory.name_key
+db.Index("ix_inventory_name_key_item_id", func.lower(Inventory.item_name), Inventory.item_id)
+
+
+# Tickets per mechanic per month (by ticket date), maintained with Mechanics.ticket_count
+mechanic_ticket_rollups = Table(
+    "mechanic_ticket_rollups",
+    db.metadata,
+    Column("mechanic_id", ForeignKey("mechanics.mechanic_id", ondelete="CASCADE"), primary_key=True),
+    Column("period", Date, primary_key=True),  # First day of the month
+    Column("ticket_count", Integer, nullable=False, default=0),
+    db.Index("ix_mechanic_ticket_rollups_period_ticket_count", "period", "ticket_count")
+)
+
+
+# Units of each item reserved per day, net of releases; feeds usage velocity
+inventory_daily_usage = Table(
+    "inventory_daily_usage",
+    db.metadata,
+    Column("item_id", ForeignKey("inventory.item_id", ondelete="CASCADE"), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("quantity", Integer, nullable=False, default=0)
+)
+
+
+# Append-only log of synced changes; change_id doubles as the sync token
+class ChangeLog(db.Model):
+    __tablename__ = "change_log"
+    __table_args__ = (
+        # Compaction keeps only the latest entry per row
+        db.Index("ix_change_log_entity_entity_id_change_id", "entity", "entity_id", "change_id"),
+        # Never reuse ids freed by compaction, or clients would skip the new entries
+        {"sqlite_autoincrement": True},
+    )
+
+    change_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(64), nullable=False)  # "12", or "12:3" for links
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)  # insert, update or delete
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# One row per compaction run; tokens at or below compacted_through may have missed a delete
+class ChangeLogCompaction(db.Model):
+    __tablename__ = "change_log_compaction"
+
+    compaction_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    compacted_through: Mapped[int] = mapped_column(Integer, nullable=False)
+    compacted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# JWTs revoked before their exp (logout); see App/utils/tokens.py
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        db.Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+# Full-text search over ServiceTicket.description
+# SQLite: an external-content FTS5 table kept in sync by triggers, so Core bulk
+# writes are indexed too. Postgres: a GIN expression index over to_tsvector(),
+# which the database maintains on its own.
+service_ticket_fts = Table(
+    "service_ticket_fts",
+    MetaData(),  # Not in db.metadata: created by the DDL below, never by create_all
+    Column("rowid", Integer, primary_key=True),
+    Column("description", String)
+)
+
+SERVICE_TICKET_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS service_ticket_fts USING fts5("
+        "description, content='service_ticket', content_rowid='ticket_id')",
+        "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ai AFTER INSERT ON service_ticket BEGIN "
+        "INSERT INTO service_ticket_fts(rowid, description) VALUES (new.ticket_id, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_ad AFTER DELETE ON service_ticket BEGIN "
+        "INSERT INTO service_ticket_fts(service_ticket_fts, rowid, description) "
+        "VALUES ('delete', old.ticket_id, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS service_ticket_fts_au AFTER UPDATE ON service_ticket BEGIN "
+        "INSERT INTO service_ticket_fts(service_ticket_fts, rowid, description) "
+        "VALUES ('delete', old.ticket_id, old.description); "
+        "INSERT INTO service_ticket_fts(rowid, description) VALUES (new.ticket_id, new.description); END",
+        "INSERT INTO service_ticket_fts(service_ticket_fts) VALUES ('rebuild')"
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS ix_service_ticket_description_fts ON service_ticket "
+        "USING GIN (to_tsvector('english', description))"
+    ]
+}
+
+for dialect, statements in SERVICE_TICKET_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(ServiceTicket.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+
+event.listen(
+    ServiceTicket.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS service_ticket_fts").execute_if(dialect="sqlite")
+)
+
+
+def create_search_index():
+    """
+    Create (or rebuild) the search index on a database whose service_ticket
+    table predates it. Safe to run repeatedly.
+    """
+    statements = SERVICE_TICKET_SEARCH_DDL.get(db.engine.dialect.name, [])
+    with db.engine.begin() as connection:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+
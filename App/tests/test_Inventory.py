@@ -1,7 +1,8 @@
 import unittest
+import io
 import json
 from App import create_app, db
-from App.models import Inventory
+from App.models import Customer, Inventory, ServiceTicket
 
 class TestInventoryRoutes(unittest.TestCase):
     @classmethod
@@ -36,7 +37,204 @@ class TestInventoryRoutes(unittest.TestCase):
     def test_get_all_inventory_items(self):
         response = self.client.get("/inventory/")
         self.assertEqual(response.status_code, 200)
-        self.assertIsInstance(response.json, list)
+        self.assertIsInstance(response.json["items"], list)
+
+    def test_get_inventory_items_filtered_and_paginated(self):
+        with self.app.app_context():
+            db.session.add_all([
+                Inventory(item_name=name, quantity=quantity, price=price)
+                for name, quantity, price in [
+                    ("Timing Belt", 4, 60.0), ("timing Chain", 9, 120.0),
+                    ("Timing Cover", 15, 35.0), ("Tire Valve", 9, 2.0),
+                ]
+            ])
+            db.session.commit()
+
+        # Case-insensitive prefix, quantity range, most expensive first
+        query = "/inventory/?name_prefix=TIMING&min_qty=5&sort=-price&limit=1"
+        first = self.client.get(query)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([item["item_name"] for item in first.json["items"]], ["timing Chain"])
+
+        second = self.client.get(f"{query}&after={first.json['next_cursor']}")
+        self.assertEqual([item["item_name"] for item in second.json["items"]], ["Timing Cover"])
+        self.assertIsNone(second.json["next_cursor"])
+
+    def test_suggest_inventory_items_tracks_changes(self):
+        with self.app.app_context():
+            item = Inventory(item_name="Front Brake Rotor", quantity=3, price=80.0)
+            db.session.add(item)
+            db.session.commit()
+            item_id = item.item_id
+
+        # Any word of the name can start the match
+        response = self.client.get("/inventory/suggest?q=roto")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({"item_id": item_id, "item_name": "Front Brake Rotor"}, response.json["suggestions"])
+
+        self.client.put(
+            f"/inventory/{item_id}",
+            data=json.dumps({"item_name": "Rear Brake Drum"}),
+            content_type="application/json"
+        )
+        self.assertEqual(self.client.get("/inventory/suggest?q=rotor").json["suggestions"], [])
+        self.assertEqual(
+            self.client.get("/inventory/suggest?q=REAR b").json["suggestions"],
+            [{"item_id": item_id, "item_name": "Rear Brake Drum"}]
+        )
+
+        self.client.delete(f"/inventory/{item_id}")
+        self.assertEqual(self.client.get("/inventory/suggest?q=rear brake").json["suggestions"], [])
+
+    def test_low_stock_report_follows_reservations(self):
+        with self.app.app_context():
+            customer = Customer(name="Low Stock", email="low-stock@example.com",
+                                address="16 Shelf St", phone="555", password_hash="x")
+            ticket = ServiceTicket(description="Battery swap", customer=customer)
+            battery = Inventory(item_name="Battery", quantity=6, price=120.0, reorder_point=4)
+            fuse = Inventory(item_name="Fuse", quantity=2, price=1.0, reorder_point=5)
+            db.session.add_all([ticket, battery, fuse])
+            db.session.commit()
+            ticket_id, battery_id, fuse_id = ticket.ticket_id, battery.item_id, fuse.item_id
+
+        def low_stock_ids():
+            return [item["item_id"] for item in self.client.get("/inventory/low-stock?days=7").json["items"]]
+
+        self.assertIn(fuse_id, low_stock_ids())
+        self.assertNotIn(battery_id, low_stock_ids())
+
+        # Reserving drops the battery to its reorder point and records today's usage
+        self.client.post(
+            f"/tickets/{ticket_id}/inventory/{battery_id}/reserve",
+            data=json.dumps({"quantity": 2}),
+            content_type="application/json"
+        )
+        items = {item["item_id"]: item for item in self.client.get("/inventory/low-stock?days=7").json["items"]}
+        self.assertEqual((items[battery_id]["quantity"], items[battery_id]["used"]), (4, 2))
+        self.assertEqual(items[battery_id]["days_of_cover"], 14.0)
+        self.assertIsNone(items[fuse_id]["days_of_cover"])
+
+        self.client.post(
+            f"/tickets/{ticket_id}/inventory/{battery_id}/release",
+            data=json.dumps({"quantity": 2}),
+            content_type="application/json"
+        )
+        self.assertNotIn(battery_id, low_stock_ids())
+
+    def test_get_inventory_items_invalid_sort(self):
+        response = self.client.get("/inventory/?sort=colour")
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_all_inventory_items_conditional(self):
+        first = self.client.get("/inventory/")
+        etag = first.headers["ETag"]
+
+        unchanged = self.client.get("/inventory/", headers={"If-None-Match": etag})
+        self.assertEqual(unchanged.status_code, 304)
+
+        self.client.post(
+            "/inventory/",
+            data=json.dumps(self.payload),
+            content_type="application/json"
+        )
+        changed = self.client.get("/inventory/", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    def test_update_inventory_item_if_match(self):
+        create_response = self.client.post(
+            "/inventory/",
+            data=json.dumps(self.payload),
+            content_type="application/json"
+        )
+        item_id = create_response.json["data"]["item_id"]
+        etag = self.client.get(f"/inventory/{item_id}").headers["ETag"]
+
+        # The first writer wins; a second writer holding the same ETag is refused
+        first = self.client.put(
+            f"/inventory/{item_id}",
+            data=json.dumps({"quantity": 40}),
+            content_type="application/json",
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json["data"]["quantity"], 40)
+        self.assertNotEqual(first.headers["ETag"], etag)
+
+        second = self.client.put(
+            f"/inventory/{item_id}",
+            data=json.dumps({"quantity": 45}),
+            content_type="application/json",
+            headers={"If-Match": etag}
+        )
+        self.assertEqual(second.status_code, 412)
+        self.assertEqual(self.client.get(f"/inventory/{item_id}").json["quantity"], 40)
+
+    def test_update_inventory_item_cannot_write_version(self):
+        create_response = self.client.post(
+            "/inventory/",
+            data=json.dumps(self.payload),
+            content_type="application/json"
+        )
+        item_id = create_response.json["data"]["item_id"]
+        self.client.put(f"/inventory/{item_id}", data=json.dumps({"quantity": 40}), content_type="application/json")
+
+        # version is the server's; sending it back would revive old ETags
+        response = self.client.put(
+            f"/inventory/{item_id}",
+            data=json.dumps({"quantity": 41, "version": 1}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/inventory/{item_id}").json["version"], 2)
+
+    def test_import_inventory_items_upserts_by_sku(self):
+        csv_file = (
+            "sku,item_name,quantity,price,supplier_note\r\n"
+            "BP-100,Brake Pads,20,25.99,ignored\r\n"
+            "OF-200,Oil Filter,35,8.50,\r\n"
+            "OF-200,Oil Filter,36,8.50,\r\n"
+            "BAD-1,Broken Row,-4,free,\r\n"
+        )
+        response = self.client.post(
+            "/inventory/import",
+            data={"file": (io.BytesIO(csv_file.encode()), "prices.csv")},
+            content_type="multipart/form-data"
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            (response.json["inserted"], response.json["updated"], response.json["duplicates"], response.json["rejected"]),
+            (2, 0, 1, 1)
+        )
+        self.assertEqual(response.json["errors"][0]["line"], 5)
+
+        with self.app.app_context():
+            brake_pads = Inventory.query.filter_by(sku="BP-100").one()
+            brake_pads.reorder_point = 10
+            db.session.commit()
+
+        # A second supplier file updates by sku instead of duplicating
+        ndjson_file = "\n".join([
+            json.dumps({"sku": "BP-100", "item_name": "Brake Pads", "quantity": 30, "price": 24.99}),
+            json.dumps({"sku": "WB-300", "item_name": "Wiper Blade", "quantity": 12, "price": 14.00}),
+        ])
+        response = self.client.post(
+            "/inventory/import?format=ndjson",
+            data=ndjson_file,
+            content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json["inserted"], response.json["updated"]), (1, 1))
+        with self.app.app_context():
+            brake_pads = Inventory.query.filter_by(sku="BP-100").one()
+            self.assertEqual(
+                (brake_pads.quantity, brake_pads.price, brake_pads.reorder_point, brake_pads.version), (30, 24.99, 10, 3)
+            )
+            self.assertEqual(Inventory.query.filter_by(sku="OF-200").one().quantity, 36)
+
+    def test_import_inventory_items_unknown_format(self):
+        response = self.client.post("/inventory/import", data="sku\n", content_type="text/plain")
+        self.assertEqual(response.status_code, 400)
 
     def test_create_inventory_item_invalid_data(self):
         invalid_payload = {
@@ -1,6 +1,10 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from App import create_app, db
-from App.models import ServiceTicket
+from App.models import ServiceTicket, Customer, Mechanics, Inventory, inventory_tickets, service_mechanics
+from App.utils.counters import rebuild_ticket_counters
+from App.utils.util import encode_token
 
 class TestServiceTicketRoutes:
     @classmethod
@@ -19,7 +23,66 @@ class TestServiceTicketRoutes:
         # Positive Test: Ensure the GET /tickets/ route works
         response = self.client.get("/tickets/")
         assert response.status_code == 200
-        assert isinstance(response.json, list)
+        assert isinstance(response.json["tickets"], list)
+        assert "next_cursor" in response.json
+
+    def test_get_service_tickets_cursor_pagination(self):
+        # Positive Test: Walk GET /tickets/ page by page using next_cursor
+        with self.app.app_context():
+            customer = Customer(name="Page Walker", email="pages@example.com",
+                                address="1 Cursor Ln", phone="555", password_hash="x")
+            db.session.add(customer)
+            db.session.flush()
+            tickets = [
+                ServiceTicket(description=f"Visit {day}", date=datetime(2023, 1, day),
+                              customer_id=customer.customer_id)
+                for day in (3, 1, 2)
+            ]
+            db.session.add_all(tickets)
+            db.session.commit()
+            expected = [t.ticket_id for t in sorted(tickets, key=lambda t: t.date)]
+
+        seen, after = [], None
+        while True:
+            url = "/tickets/?limit=2" + (f"&after={after}" if after else "")
+            response = self.client.get(url)
+            assert response.status_code == 200
+            assert len(response.json["tickets"]) <= 2
+            seen.extend(ticket["ticket_id"] for ticket in response.json["tickets"])
+            after = response.json["next_cursor"]
+            if not after:
+                break
+        assert [ticket_id for ticket_id in seen if ticket_id in expected] == expected
+
+    def test_get_service_tickets_strict_eager_loading(self):
+        # Positive Test: Serialization issues no lazy loads when strict mode is on
+        with self.app.app_context():
+            customer = Customer(name="Strict Loader", email="strict@example.com",
+                                address="2 Eager St", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Selectin Sam", address="3 Garage Rd", salary=40000)
+            part = Inventory(item_name="Spark Plug", quantity=10, price=4.5)
+            ticket = ServiceTicket(description="Tune-up", customer=customer,
+                                   mechanics=[mechanic], inventory_items=[part])
+            db.session.add(ticket)
+            db.session.commit()
+            ticket_id = ticket.ticket_id
+
+        self.app.config["STRICT_EAGER_LOADING"] = True
+        try:
+            list_response = self.client.get("/tickets/?limit=200")
+            detail_response = self.client.get(f"/tickets/{ticket_id}")
+        finally:
+            self.app.config["STRICT_EAGER_LOADING"] = False
+
+        assert list_response.status_code == 200
+        assert detail_response.status_code == 200
+        assert detail_response.json["mechanics"] and detail_response.json["inventory_items"]
+
+    def test_get_service_tickets_invalid_cursor(self):
+        # Negative Test: A garbled cursor is rejected
+        response = self.client.get("/tickets/?after=not-a-cursor")
+        assert response.status_code == 400
+        assert "error" in response.json
 
     def test_create_service_ticket(self):
         # Positive Test: Ensure the POST /tickets/ route works
@@ -51,6 +114,115 @@ class TestServiceTicketRoutes:
         assert response.status_code == 400
         assert "error" in response.json
 
+    def test_create_service_tickets_bulk(self):
+        # Positive Test: POST /tickets/bulk creates valid rows and reports rejected ones
+        with self.app.app_context():
+            customer = Customer(name="Fleet Owner", email="fleet@example.com",
+                                address="4 Depot Way", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Bulk Bob", address="5 Bay St", salary=45000)
+            part = Inventory(item_name="Oil Filter", quantity=20, price=9.99)
+            db.session.add_all([customer, mechanic, part])
+            db.session.commit()
+            token = encode_token(customer.customer_id)
+            mechanic_id, item_id = mechanic.mechanic_id, part.item_id
+
+        payload = [
+            {"description": "Oil change", "mechanic_ids": [mechanic_id], "inventory_ids": [item_id]},
+            {"description": "Tyre rotation", "date": "2023-11-01T10:00:00"},
+            {"description": ""},
+            {"description": "Ghost mechanic", "mechanic_ids": [999999]}
+        ]
+        response = self.client.post(
+            "/tickets/bulk",
+            data=json.dumps(payload),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 207
+        assert response.json["created"] == 2
+        assert [row["status"] for row in response.json["results"]] == [
+            "created", "created", "rejected", "rejected"
+        ]
+
+        with self.app.app_context():
+            ticket = db.session.get(ServiceTicket, response.json["results"][0]["ticket_id"])
+            assert [m.mechanic_id for m in ticket.mechanics] == [mechanic_id]
+            assert [i.item_id for i in ticket.inventory_items] == [item_id]
+
+    def test_create_service_tickets_bulk_requires_array(self):
+        # Negative Test: POST /tickets/bulk rejects a non-array body
+        with self.app.app_context():
+            token = encode_token(1)
+        response = self.client.post(
+            "/tickets/bulk",
+            data=json.dumps({"description": "Not a list"}),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 400
+        assert "error" in response.json
+
+    def test_export_service_tickets_streams_rows(self):
+        # Positive Test: GET /tickets/export streams NDJSON and CSV with flattened ids
+        with self.app.app_context():
+            customer = Customer(name="Accounting", email="ledger@example.com",
+                                address="8 Ledger Ln", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Export Ed", address="9 Bay St", salary=41000)
+            ticket = ServiceTicket(description="Month-end brake job", date=datetime(2021, 6, 15),
+                                   customer=customer, mechanics=[mechanic])
+            db.session.add(ticket)
+            db.session.commit()
+            ticket_id, mechanic_id = ticket.ticket_id, mechanic.mechanic_id
+
+        response = self.client.get("/tickets/export?format=ndjson&from=2021-06-01&to=2021-07-01")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [row["ticket_id"] for row in rows] == [ticket_id]
+        assert rows[0]["mechanic_ids"] == [mechanic_id]
+
+        response = self.client.get("/tickets/export?format=csv&from=2021-06-01&to=2021-07-01")
+        assert response.status_code == 200
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0] == "ticket_id,description,date,customer_id,mechanic_ids,inventory_ids"
+        assert lines[1].startswith(f"{ticket_id},Month-end brake job,")
+
+    def test_export_service_tickets_invalid_format(self):
+        # Negative Test: GET /tickets/export rejects unknown formats
+        response = self.client.get("/tickets/export?format=xml")
+        assert response.status_code == 400
+        assert "error" in response.json
+
+    def test_search_service_tickets_stays_in_sync(self):
+        # Positive Test: GET /tickets/search ranks matches and follows updates and deletes
+        with self.app.app_context():
+            customer = Customer(name="Advisor", email="advisor@example.com",
+                                address="10 Search St", phone="555", password_hash="x")
+            squeal = ServiceTicket(description="Camshaft squeal on cold start", customer=customer)
+            belt = ServiceTicket(description="Flywheel resurfacing", customer=customer)
+            db.session.add_all([squeal, belt])
+            db.session.commit()
+            squeal_id, belt_id = squeal.ticket_id, belt.ticket_id
+
+        response = self.client.get("/tickets/search?q=camshaft squeal")
+        assert response.status_code == 200
+        assert [t["ticket_id"] for t in response.json["tickets"]] == [squeal_id]
+
+        with self.app.app_context():
+            db.session.get(ServiceTicket, belt_id).description = "Camshaft seal and flywheel resurfacing"
+            db.session.delete(db.session.get(ServiceTicket, squeal_id))
+            db.session.commit()
+
+        response = self.client.get("/tickets/search?q=camshaft")
+        assert [t["ticket_id"] for t in response.json["tickets"]] == [belt_id]
+        assert response.json["total"] == 1
+
+    def test_search_service_tickets_requires_query(self):
+        # Negative Test: GET /tickets/search without q
+        response = self.client.get("/tickets/search?q=%22%22")
+        assert response.status_code == 400
+        assert "error" in response.json
+
     def test_get_service_ticket_not_found(self):
         # Negative Test: Test GET /tickets/{ticket_id} with non-existent ID
         response = self.client.get("/tickets/999")
@@ -85,6 +257,333 @@ class TestServiceTicketRoutes:
         assert update_response.status_code == 200
         assert update_response.json["description"] == "Brake replacement"
 
+    def test_edit_and_assign_mechanics_set_based(self):
+        # Positive Test: PUT /tickets/{ticket_id}/edit and assign-mechanic apply set changes
+        with self.app.app_context():
+            customer = Customer(name="Shift Change", email="shift@example.com",
+                                address="6 Dispatch Ave", phone="555", password_hash="x")
+            mechanics = [Mechanics(name=f"Crew {n}", address="7 Bay St", salary=40000) for n in range(3)]
+            ticket = ServiceTicket(description="Engine rebuild", customer=customer, mechanics=mechanics[:1])
+            db.session.add_all([ticket, *mechanics])
+            db.session.commit()
+            ticket_id = ticket.ticket_id
+            first, second, third = (m.mechanic_id for m in mechanics)
+
+        response = self.client.put(
+            f"/tickets/{ticket_id}/edit",
+            data=json.dumps({"add_ids": [second, third, 999999], "remove_ids": [first]}),
+            content_type="application/json"
+        )
+        assert response.status_code == 200
+        assert sorted(response.json["data"]["mechanics"]) == sorted([second, third])
+
+        # Assigning an already-linked mechanic is a no-op, not an integrity error
+        response = self.client.put(f"/tickets/{ticket_id}/assign-mechanic/{second}")
+        assert response.status_code == 200
+        assert sorted(response.json["data"]["mechanics"]) == sorted([second, third])
+
+        response = self.client.put(f"/tickets/{ticket_id}/remove-mechanic/{third}")
+        assert response.status_code == 200
+        assert response.json["data"]["mechanics"] == [second]
+
+        response = self.client.put(f"/tickets/{ticket_id}/assign-mechanic/999999")
+        assert response.status_code == 404
+
+    def test_ticket_counters_follow_assignments(self):
+        # Positive Test: Counters and the period leaderboard track assign, remove, edit and delete
+        with self.app.app_context():
+            customer = Customer(name="Leader Board", email="leaders@example.com",
+                                address="8 Podium Rd", phone="555", password_hash="x")
+            mechanics = [Mechanics(name="Same Name", address="9 Bay St", salary=40000) for _ in range(2)]
+            tickets = [
+                ServiceTicket(description=f"March job {n}", date=datetime(2019, 3, 10 + n),
+                              customer=customer, mechanics=mechanics[:1])
+                for n in range(2)
+            ]
+            db.session.add_all([*tickets, *mechanics])
+            db.session.commit()
+            first, second = (m.mechanic_id for m in mechanics)
+            ticket_ids = [t.ticket_id for t in tickets]
+
+        self.client.put(f"/tickets/{ticket_ids[0]}/assign-mechanic/{second}")
+        self.client.put(f"/tickets/{ticket_ids[0]}/assign-mechanic/{second}")  # no-op
+        self.client.put(f"/tickets/{ticket_ids[1]}/edit",
+                        data=json.dumps({"add_ids": [second], "remove_ids": [first]}),
+                        content_type="application/json")
+        response = self.client.get("/mechanics/leaderboard?period=2019-03")
+        assert response.status_code == 200
+        assert [(m["mechanic_id"], m["ticket_count"]) for m in response.json["mechanics"]] == [(second, 2), (first, 1)]
+
+        self.client.delete(f"/tickets/{ticket_ids[0]}")
+        response = self.client.get("/mechanics/leaderboard?period=2019&top=1")
+        assert [(m["mechanic_id"], m["ticket_count"]) for m in response.json["mechanics"]] == [(second, 1)]
+
+        # Every counter agrees with the junction table
+        with self.app.app_context():
+            linked = dict(db.session.execute(
+                db.select(service_mechanics.c.mechanic_id, db.func.count()).group_by(service_mechanics.c.mechanic_id)
+            ).all())
+            for mechanic_id, ticket_count in db.session.execute(db.select(Mechanics.mechanic_id, Mechanics.ticket_count)):
+                assert ticket_count == linked.get(mechanic_id, 0)
+
+    def test_update_ticket_date_moves_rollups(self):
+        # Positive Test: PUT with an ISO date re-dates the ticket and cached leaderboards follow
+        with self.app.app_context():
+            customer = Customer(name="Re Dated", email="redated@example.com",
+                                address="1 Calendar Ct", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Month Mover", address="2 Calendar Ct", salary=40000)
+            ticket = ServiceTicket(description="January job", date=datetime(2018, 1, 15),
+                                   customer=customer, mechanics=[mechanic])
+            db.session.add(ticket)
+            db.session.commit()
+            customer_id, mechanic_id, ticket_id = customer.customer_id, mechanic.mechanic_id, ticket.ticket_id
+
+        def leaders(period):
+            response = self.client.get(f"/mechanics/leaderboard?period={period}")
+            return [m["mechanic_id"] for m in response.json["mechanics"]]
+
+        assert leaders("2018-01") == [mechanic_id]
+        assert leaders("2018-03") == []
+        response = self.client.put(f"/tickets/{ticket_id}", json={"date": "2018-03-01T10:00:00"})
+        assert response.status_code == 200
+        assert leaders("2018-01") == []
+        assert leaders("2018-03") == [mechanic_id]
+
+        response = self.client.put(f"/tickets/{ticket_id}", json={"date": "next week"})
+        assert response.status_code == 400
+
+        # A counter rebuild invalidates the mechanic's own cached view too
+        assert self.client.get(f"/mechanics/{mechanic_id}").json["ticket_count"] == 1
+        with self.app.app_context():
+            other = ServiceTicket(description="Linked behind the counters", customer_id=customer_id)
+            db.session.add(other)
+            db.session.commit()
+            db.session.execute(db.insert(service_mechanics).values(ticket_id=other.ticket_id, mechanic_id=mechanic_id))
+            db.session.commit()
+            rebuild_ticket_counters()
+        assert self.client.get(f"/mechanics/{mechanic_id}").json["ticket_count"] == 2
+
+    def test_leaderboard_invalid_params(self):
+        # Negative Test: Malformed period and out-of-range top are rejected
+        assert self.client.get("/mechanics/leaderboard?period=March").status_code == 400
+        assert self.client.get("/mechanics/leaderboard?top=0").status_code == 400
+
+    def least_loaded(self, exclude=()):
+        with self.app.app_context():
+            return db.session.execute(
+                db.select(Mechanics.mechanic_id)
+                .where(Mechanics.mechanic_id.not_in(exclude))
+                .order_by(Mechanics.ticket_count, Mechanics.mechanic_id)
+            ).scalars().first()
+
+    def test_auto_assign_picks_least_loaded_mechanic(self):
+        # Positive Test: Auto-assignment follows loads changed by manual assignments too
+        with self.app.app_context():
+            customer = Customer(name="Auto Dispatch", email="dispatch@example.com",
+                                address="10 Queue St", phone="555", password_hash="x")
+            tickets = [ServiceTicket(description=f"Queued job {n}", customer=customer) for n in range(4)]
+            db.session.add_all([*tickets, Mechanics(name="Idle Ivan", address="11 Bay St", salary=40000)])
+            db.session.commit()
+            ticket_ids = [t.ticket_id for t in tickets]
+
+        expected = self.least_loaded()
+        response = self.client.post(f"/tickets/{ticket_ids[0]}/auto-assign")
+        assert response.status_code == 200
+        assert response.json["mechanic_id"] == expected
+
+        # Load that mechanic by hand; the scheduler must notice
+        for ticket_id in ticket_ids[1:3]:
+            self.client.put(f"/tickets/{ticket_id}/assign-mechanic/{expected}")
+        least = self.least_loaded()
+        response = self.client.post(f"/tickets/{ticket_ids[3]}/auto-assign")
+        assert response.json["mechanic_id"] == least != expected
+
+        # A mechanic already on the ticket is never picked again
+        response = self.client.post(f"/tickets/{ticket_ids[0]}/auto-assign")
+        assert response.json["mechanic_id"] != expected
+
+    def test_auto_assign_backlog_balances_loads(self):
+        # Positive Test: The batch call assigns every unassigned ticket, least-loaded first
+        with self.app.app_context():
+            customer = Customer(name="Backlog Bob", email="backlog@example.com",
+                                address="12 Queue St", phone="555", password_hash="x")
+            db.session.add_all([ServiceTicket(description=f"Backlog {n}", customer=customer) for n in range(25)])
+            db.session.commit()
+            loads = dict(db.session.execute(db.select(Mechanics.mechanic_id, Mechanics.ticket_count)).all())
+
+        response = self.client.post("/tickets/auto-assign")
+        assert response.status_code == 200
+        assert response.json["unassigned"] == 0
+        for assignment in response.json["assigned"]:
+            least = min(loads, key=lambda mechanic_id: (loads[mechanic_id], mechanic_id))
+            assert assignment["mechanic_id"] == least
+            loads[least] += 1
+
+        with self.app.app_context():
+            assert dict(db.session.execute(db.select(Mechanics.mechanic_id, Mechanics.ticket_count)).all()) == loads
+        assert self.client.post("/tickets/auto-assign").json["assigned"] == []
+
+    def test_mechanic_ticket_history_paginates(self):
+        # Positive Test: The mechanic payload carries a count; history pages newest first within a date range
+        with self.app.app_context():
+            customer = Customer(name="Veteran Fan", email="veteran@example.com",
+                                address="13 History Ln", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Veteran Vic", address="14 Bay St", salary=60000)
+            tickets = [
+                ServiceTicket(description=f"Job {day}", date=datetime(2018, 5, day),
+                              customer=customer, mechanics=[mechanic])
+                for day in (1, 2, 3, 4)
+            ]
+            db.session.add_all(tickets)
+            db.session.commit()
+            mechanic_id = mechanic.mechanic_id
+            expected = [t.ticket_id for t in sorted(tickets, key=lambda t: t.date, reverse=True)]
+
+        payload = self.client.get(f"/mechanics/{mechanic_id}").json
+        assert "tickets" not in payload and payload["ticket_count"] == 4
+
+        seen, after = [], None
+        while True:
+            response = self.client.get(f"/mechanics/{mechanic_id}/tickets?limit=3" + (f"&after={after}" if after else ""))
+            assert response.status_code == 200
+            seen.extend(ticket["ticket_id"] for ticket in response.json["tickets"])
+            after = response.json["next_cursor"]
+            if not after:
+                break
+        assert seen == expected
+
+        response = self.client.get(f"/mechanics/{mechanic_id}/tickets?from=2018-05-02&to=2018-05-04")
+        assert [ticket["ticket_id"] for ticket in response.json["tickets"]] == expected[1:3]
+
+        # Deleting the mechanic removes its links without loading them
+        assert self.client.delete(f"/mechanics/{mechanic_id}").status_code == 200
+        with self.app.app_context():
+            assert not db.session.scalar(
+                db.select(db.func.count()).where(service_mechanics.c.mechanic_id == mechanic_id)
+            )
+
+    def test_mechanic_ticket_history_invalid_params(self):
+        # Negative Test: Unknown mechanic and malformed dates
+        assert self.client.get("/mechanics/999999/tickets").status_code == 404
+        with self.app.app_context():
+            mechanic = Mechanics(name="Param Pat", address="15 Bay St", salary=40000)
+            db.session.add(mechanic)
+            db.session.commit()
+            mechanic_id = mechanic.mechanic_id
+        assert self.client.get(f"/mechanics/{mechanic_id}/tickets?from=yesterday").status_code == 400
+
+    def test_cached_views_invalidated_on_commit(self):
+        # Positive Test: Cached ticket and mechanic views never serve data older than the last commit
+        with self.app.app_context():
+            customer = Customer(name="Cache Buster", email="tags@example.com",
+                                address="11 Tag St", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Tagged Tess", address="12 Bay St", salary=42000)
+            ticket = ServiceTicket(description="Coolant flush", customer=customer)
+            db.session.add_all([ticket, mechanic])
+            db.session.commit()
+            ticket_id, mechanic_id = ticket.ticket_id, mechanic.mechanic_id
+
+        assert self.client.get(f"/tickets/{ticket_id}").json["description"] == "Coolant flush"
+        assert self.client.get(f"/mechanics/{mechanic_id}").json["ticket_count"] == 0
+
+        # ORM update: the row tag is bumped from the session's after_commit event
+        self.client.put(
+            f"/tickets/{ticket_id}",
+            data=json.dumps({"description": "Coolant flush and thermostat"}),
+            content_type="application/json"
+        )
+        assert self.client.get(f"/tickets/{ticket_id}").json["description"] == "Coolant flush and thermostat"
+
+        # Core junction insert: tags reported by the helper
+        self.client.put(f"/tickets/{ticket_id}/assign-mechanic/{mechanic_id}")
+        assert self.client.get(f"/tickets/{ticket_id}").json["mechanics"] == [mechanic_id]
+        assert self.client.get(f"/mechanics/{mechanic_id}").json["ticket_count"] == 1
+
+    def test_conditional_get_uses_row_versions(self):
+        # Positive Test: If-None-Match returns 304 until a link change bumps the mechanic's version
+        with self.app.app_context():
+            customer = Customer(name="Dashboard", email="etag@example.com",
+                                address="13 Poll St", phone="555", password_hash="x")
+            mechanic = Mechanics(name="Versioned Val", address="14 Bay St", salary=43000)
+            ticket = ServiceTicket(description="Wheel alignment", customer=customer)
+            db.session.add_all([ticket, mechanic])
+            db.session.commit()
+            ticket_id, mechanic_id = ticket.ticket_id, mechanic.mechanic_id
+
+        first = self.client.get(f"/mechanics/{mechanic_id}")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+
+        unchanged = self.client.get(f"/mechanics/{mechanic_id}", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.get_data() == b""
+
+        self.client.put(f"/tickets/{ticket_id}/assign-mechanic/{mechanic_id}")
+        changed = self.client.get(f"/mechanics/{mechanic_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json["ticket_count"] == 1
+
+        # Deleting the ticket through the ORM removes the link and bumps the mechanic again
+        self.client.delete(f"/tickets/{ticket_id}")
+        after_delete = self.client.get(f"/mechanics/{mechanic_id}", headers={"If-None-Match": changed.headers["ETag"]})
+        assert after_delete.status_code == 200
+        assert after_delete.json["ticket_count"] == 0
+
+    def test_reserve_inventory_is_atomic_under_concurrency(self):
+        # Positive Test: Parallel reservations never oversell and every unit is accounted for
+        with self.app.app_context():
+            customer = Customer(name="Counter", email="reserve@example.com",
+                                address="15 Parts St", phone="555", password_hash="x")
+            item = Inventory(item_name="Spark plug", quantity=10, price=4.5)
+            tickets = [ServiceTicket(description=f"Tune-up {i}", customer=customer) for i in range(4)]
+            db.session.add_all([item, *tickets])
+            db.session.commit()
+            item_id, ticket_ids = item.item_id, [ticket.ticket_id for ticket in tickets]
+
+        def reserve(ticket_id):
+            client = self.app.test_client()
+            return client.post(
+                f"/tickets/{ticket_id}/inventory/{item_id}/reserve",
+                data=json.dumps({"quantity": 1}),
+                content_type="application/json"
+            ).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(reserve, ticket_ids * 4))
+        assert statuses.count(200) == 10
+        assert statuses.count(409) == 6
+
+        released = self.client.post(
+            f"/tickets/{ticket_ids[0]}/inventory/{item_id}/release",
+            data=json.dumps({"quantity": 1}),
+            content_type="application/json"
+        )
+        assert released.status_code == 200
+        assert released.json["in_stock"] == 1
+
+        over_release = self.client.post(
+            f"/tickets/{ticket_ids[0]}/inventory/{item_id}/release",
+            data=json.dumps({"quantity": 99}),
+            content_type="application/json"
+        )
+        assert over_release.status_code == 409
+
+        with self.app.app_context():
+            reserved = db.session.scalar(
+                db.select(db.func.sum(inventory_tickets.c.quantity)).where(inventory_tickets.c.item_id == item_id)
+            )
+            assert reserved + db.session.get(Inventory, item_id).quantity == 10
+
+    def test_reserve_inventory_invalid_quantity(self):
+        # Negative Test: Quantity must be a positive integer
+        response = self.client.post(
+            "/tickets/1/inventory/1/reserve",
+            data=json.dumps({"quantity": 0}),
+            content_type="application/json"
+        )
+        assert response.status_code == 400
+
     def test_update_service_ticket_not_found(self):
         # Negative Test: Test PUT /tickets/{ticket_id}/edit with non-existent ID
         update_payload = {
@@ -0,0 +1,33 @@
+from flask_caching.backends import FileSystemCache
+from App.utils.cache_backends import TieredCache
+
+
+class TestTieredCache:
+    def make_worker(self, cache_dir, **kwargs):
+        # Each instance stands in for one gunicorn worker sharing the L2 directory
+        return TieredCache(FileSystemCache(str(cache_dir)), **kwargs)
+
+    def test_l2_is_shared_between_workers(self, tmp_path):
+        # Positive Test: A value written by one worker is read by another
+        first, second = self.make_worker(tmp_path), self.make_worker(tmp_path)
+        first.set("view/abc", {"tickets": []})
+        assert second.get("view/abc") == {"tickets": []}
+
+    def test_l1_is_bounded_lru(self, tmp_path):
+        # Positive Test: L1 keeps only the most recently used keys
+        worker = self.make_worker(tmp_path, l1_size=2)
+        worker.set("view/a", 1)
+        worker.set("view/b", 2)
+        worker.get("view/a")
+        worker.set("view/c", 3)
+        assert list(worker._l1) == ["view/a", "view/c"]
+        assert worker.get("view/b") == 2  # Still served from L2
+
+    def test_bypass_prefix_always_reads_l2(self, tmp_path):
+        # Positive Test: Tag versions bumped by one worker are seen at once by another
+        first, second = self.make_worker(tmp_path), self.make_worker(tmp_path)
+        first.set("tag/mechanics", "v1", timeout=0)
+        assert second.get("tag/mechanics") == "v1"
+        first.set("tag/mechanics", "v2", timeout=0)
+        assert second.get_many("tag/mechanics") == ["v2"]
+        assert "tag/mechanics" not in second._l1
@@ -1,11 +1,20 @@
 import json
+import threading
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
 from App import create_app, db
-from App.models import Customer
+from App.models import Customer, Inventory, Mechanics, ServiceTicket, inventory_tickets, service_mechanics
+from App.utils.passwords import PasswordHasher, PasswordHasherBusy
+from App.utils.tokens import revoked_tokens
+from App.utils.util import encode_token
 
 class TestCustomerRoutes:
     @classmethod
     def setup_class(cls):
         cls.app = create_app("testing")
+        cls.app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"  # Fast hashes for tests
         cls.client = cls.app.test_client()
         with cls.app.app_context():
             db.create_all()
@@ -123,4 +132,251 @@ class TestCustomerRoutes:
         # Negative Test: Test DELETE /customers/{customer_id} with non-existent ID
         response = self.client.delete("/customers/999")
         assert response.status_code == 404
-        assert "error" in response.json
\ No newline at end of file
+        assert "error" in response.json
+
+    def test_login_rehashes_outdated_password(self):
+        # Positive Test: A password stored with old parameters is upgraded on login
+        with self.app.app_context():
+            customer = Customer(name="Old Hash", email="oldhash@example.com", address="1 Legacy Ln",
+                                phone="555", password_hash=generate_password_hash("s3cret", "pbkdf2:sha256:1000"))
+            db.session.add(customer)
+            db.session.commit()
+            customer_id = customer.customer_id
+
+        response = self.client.post("/customers/login", json={"email": "oldhash@example.com", "password": "s3cret"})
+        assert response.status_code == 200
+        with self.app.app_context():
+            assert db.session.get(Customer, customer_id).password_hash.startswith("pbkdf2:sha256:2000$")
+
+        response = self.client.post("/customers/login", json={"email": "oldhash@example.com", "password": "wrong"})
+        assert response.status_code == 401
+
+    def test_login_returns_503_when_hash_pool_saturated(self):
+        # Negative Test: A full hashing pool sheds load instead of queueing
+        with self.app.app_context():
+            db.session.add(Customer(name="Rush Hour", email="rush@example.com", address="2 Opening Ave",
+                                    phone="555", password_hash=generate_password_hash("s3cret", "pbkdf2:sha256:2000")))
+            db.session.commit()
+        hasher = PasswordHasher(workers=1, queue_depth=0, method="pbkdf2:sha256:2000", salt_length=16)
+        started, release = threading.Event(), threading.Event()
+        worker = threading.Thread(target=hasher._run, args=(lambda: started.set() or release.wait(),))
+        previous = self.app.extensions.get("password_hasher")
+        self.app.extensions["password_hasher"] = hasher
+        try:
+            worker.start()
+            started.wait(5)
+            response = self.client.post("/customers/login", json={"email": "rush@example.com", "password": "s3cret"})
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+        finally:
+            release.set()
+            worker.join()
+            self.app.extensions["password_hasher"] = previous
+
+    def test_hash_many_shares_slots_and_rehash_checks_salt(self):
+        # Negative Test: A batch cannot hash past a full pool; a shorter salt than configured needs a rehash
+        hasher = PasswordHasher(workers=1, queue_depth=0, method="pbkdf2:sha256:2000", salt_length=16)
+        hasher.BATCH_SLOT_TIMEOUT = 0.1
+        started, release = threading.Event(), threading.Event()
+        worker = threading.Thread(target=hasher._run, args=(lambda: started.set() or release.wait(),))
+        try:
+            worker.start()
+            started.wait(5)
+            with pytest.raises(PasswordHasherBusy):
+                hasher.hash_many(["a", "b"])
+        finally:
+            release.set()
+            worker.join()
+        password_hashes = hasher.hash_many(["a", "b"])
+        assert [hasher.needs_rehash(h) for h in password_hashes] == [False, False]
+        assert hasher.needs_rehash(generate_password_hash("a", "pbkdf2:sha256:2000", salt_length=8))
+
+    def test_logout_revokes_token_in_every_worker(self):
+        # Positive Test: A token works until logout, then is refused here and by a fresh worker
+        with self.app.app_context():
+            customer = Customer(name="Logout Lou", email="logout@example.com", address="3 Exit Rd",
+                                phone="555", password_hash="x")
+            db.session.add(customer)
+            db.session.commit()
+            token = encode_token(customer.customer_id)
+            other_token = encode_token(customer.customer_id)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert self.client.get("/tickets/my-tickets", headers=headers).status_code != 403
+        assert self.client.get("/tickets/my-tickets", headers=headers).status_code != 403  # cached claims
+        assert self.client.post("/customers/logout", headers=headers).status_code == 200
+
+        assert self.client.get("/tickets/my-tickets", headers=headers).status_code == 403
+        other_worker = create_app("testing").test_client()
+        assert other_worker.get("/tickets/my-tickets", headers=headers).status_code == 403
+        # Only the presented token is revoked
+        assert self.client.get("/tickets/my-tickets",
+                               headers={"Authorization": f"Bearer {other_token}"}).status_code != 403
+
+    def test_rolled_back_revocation_is_not_applied(self):
+        # Negative Test: A revocation whose commit never happens leaves the token valid
+        with self.app.app_context():
+            revoked_tokens().add("rolled-back-jti", datetime.utcnow() + timedelta(hours=1))
+            assert "rolled-back-jti" not in revoked_tokens()
+            db.session.rollback()
+            assert "rolled-back-jti" not in revoked_tokens()
+
+    def test_malformed_authorization_header(self):
+        # Negative Test: A header without the "Bearer <token>" shape is rejected, not a crash
+        for value in ("Bearer", "garbage", "Bearer a b"):
+            response = self.client.get("/tickets/my-tickets", headers={"Authorization": value})
+            assert response.status_code == 403
+
+    def test_bulk_create_customers(self):
+        # Positive Test: Valid rows are created with hashed passwords, conflicts come back per row
+        with self.app.app_context():
+            db.session.add(Customer(name="Existing", email="taken@example.com", address="4 Old St",
+                                    phone="555", password_hash="x"))
+            db.session.commit()
+            token = encode_token(1)
+        payload = [
+            {"name": "Bulk One", "email": "bulk1@example.com", "address": "5 Fleet Rd", "phone": "555", "password": "pw1"},
+            {"name": "Bulk Two", "email": "taken@example.com", "address": "6 Fleet Rd", "phone": "555", "password": "pw2"},
+            {"name": "Bulk Three", "email": "bulk1@example.com", "address": "7 Fleet Rd", "phone": "555", "password": "pw3"},
+            {"name": "", "email": "not-an-email", "address": "8 Fleet Rd", "phone": "555"},
+            {"name": "Bulk Five", "email": "bulk5@example.com", "address": "9 Fleet Rd", "phone": "555", "password": "pw5"}
+        ]
+        response = self.client.post("/customers/bulk", json=payload, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 207
+        assert response.json["created"] == 2
+        assert [row["status"] for row in response.json["results"]] == [
+            "created", "rejected", "rejected", "rejected", "created"
+        ]
+        assert set(response.json["results"][3]["errors"]) == {"name", "email", "password"}
+
+        response = self.client.post("/customers/login", json={"email": "bulk5@example.com", "password": "pw5"})
+        assert response.status_code == 200
+
+    def test_bulk_create_customers_invalid_payload(self):
+        # Negative Test: The batch must be a JSON array within the size limit, and needs a token
+        with self.app.app_context():
+            token = encode_token(1)
+        headers = {"Authorization": f"Bearer {token}"}
+        assert self.client.post("/customers/bulk", json={"name": "x"}, headers=headers).status_code == 400
+        assert self.client.post("/customers/bulk", json=[{}] * 1001, headers=headers).status_code == 400
+        assert self.client.post("/customers/bulk", json=[]).status_code == 403
+        # Only customers allowed by BULK_IMPORT_CUSTOMER_IDS may onboard others
+        with self.app.app_context():
+            other_token = encode_token(2)
+        response = self.client.post("/customers/bulk", json=[], headers={"Authorization": f"Bearer {other_token}"})
+        assert response.status_code == 403
+
+    def test_delete_customer_cascades_in_one_statement(self):
+        # Positive Test: The customer's tickets and links go with one DELETE, and counters follow
+        with self.app.app_context():
+            mechanic = Mechanics(name="Fleet Mechanic", address="10 Depot Rd", salary=50000)
+            item = Inventory(item_name="Fleet Filter", quantity=5, price=9.5)
+            customer = Customer(name="Fleet Co", email="fleet@example.com", address="11 Depot Rd",
+                                phone="555", password_hash="x")
+            customer.tickets = [
+                ServiceTicket(description=f"Fleet job {n}", date=datetime(2020, 1, 1 + n),
+                              mechanics=[mechanic], inventory_items=[item])
+                for n in range(20)
+            ]
+            db.session.add(customer)
+            db.session.commit()
+            customer_id, mechanic_id, item_id = customer.customer_id, mechanic.mechanic_id, item.item_id
+            token = encode_token(customer_id)
+
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.delete(f"/customers/{customer_id}", headers={"Authorization": f"Bearer {token}"})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert response.status_code == 200
+        assert len([s for s in statements if s.startswith("DELETE")]) == 1
+
+        with self.app.app_context():
+            assert db.session.get(Customer, customer_id) is None
+            assert db.session.scalar(db.select(db.func.count()).select_from(ServiceTicket)
+                                     .where(ServiceTicket.customer_id == customer_id)) == 0
+            assert db.session.scalar(db.select(db.func.count()).select_from(service_mechanics)
+                                     .where(service_mechanics.c.mechanic_id == mechanic_id)) == 0
+            assert db.session.scalar(db.select(db.func.count()).select_from(inventory_tickets)
+                                     .where(inventory_tickets.c.item_id == item_id)) == 0
+            assert db.session.get(Mechanics, mechanic_id).ticket_count == 0
+
+        response = self.client.delete(f"/customers/{customer_id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 404
+
+    def test_delete_other_customer_is_forbidden(self):
+        # Negative Test: A token only deletes its own customer, never another one and their tickets
+        with self.app.app_context():
+            owner = Customer(name="Owner", email="owner@example.com", address="14 Own St",
+                             phone="555", password_hash="x")
+            owner.tickets = [ServiceTicket(description="Keep me", date=datetime(2022, 1, 1))]
+            intruder = Customer(name="Intruder", email="intruder@example.com", address="15 Other St",
+                                phone="555", password_hash="x")
+            db.session.add_all([owner, intruder])
+            db.session.commit()
+            owner_id = owner.customer_id
+            token = encode_token(intruder.customer_id)
+
+        response = self.client.delete(f"/customers/{owner_id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+        with self.app.app_context():
+            assert db.session.get(Customer, owner_id) is not None
+            assert db.session.scalar(db.select(db.func.count()).select_from(ServiceTicket)
+                                     .where(ServiceTicket.customer_id == owner_id)) == 1
+
+    def test_customer_summary_aggregates_and_follows_ticket_changes(self):
+        # Positive Test: Visits, parts cost and mechanics seen, refreshed when the customer's tickets change
+        with self.app.app_context():
+            mechanics = [Mechanics(name=f"Regular {n}", address="12 Bay St", salary=40000) for n in range(2)]
+            item = Inventory(item_name="Summary Pads", quantity=10, price=20.0)
+            customer = Customer(name="Front Desk", email="summary@example.com", address="13 Main St",
+                                phone="555", password_hash="x")
+            customer.tickets = [
+                ServiceTicket(description="Brakes", date=datetime(2021, 5, 1), mechanics=mechanics,
+                              inventory_items=[item]),
+                ServiceTicket(description="Tyres", date=datetime(2021, 6, 1), mechanics=mechanics[1:])
+            ]
+            db.session.add(customer)
+            db.session.commit()
+            customer_id, item_id = customer.customer_id, item.item_id
+            first, second = (m.mechanic_id for m in mechanics)
+            ticket_ids = [t.ticket_id for t in customer.tickets]
+
+        response = self.client.get(f"/customers/{customer_id}/summary")
+        assert response.status_code == 200
+        assert response.json["visits"] == 2
+        assert response.json["first_visit"] == "2021-05-01T00:00:00"
+        assert response.json["last_visit"] == "2021-06-01T00:00:00"
+        assert response.json["parts_cost"] == 0.0  # nothing reserved yet
+        assert [(m["mechanic_id"], m["visits"]) for m in response.json["top_mechanics"]] == [(second, 2), (first, 1)]
+        assert len(self.client.get(f"/customers/{customer_id}/summary?top=1").json["top_mechanics"]) == 1
+
+        self.client.put(f"/tickets/{ticket_ids[1]}/assign-mechanic/{first}")
+        self.client.post(f"/tickets/{ticket_ids[0]}/inventory/{item_id}/reserve", json={"quantity": 3})
+        response = self.client.get(f"/customers/{customer_id}/summary")
+        assert [(m["mechanic_id"], m["visits"]) for m in response.json["top_mechanics"]] == [(first, 2), (second, 2)]
+        assert response.json["parts_cost"] == 60.0
+
+        # A fully released line is no longer billed
+        self.client.post(f"/tickets/{ticket_ids[0]}/inventory/{item_id}/release", json={"quantity": 3})
+        assert self.client.get(f"/customers/{customer_id}/summary").json["parts_cost"] == 0.0
+
+        # Prices and mechanic names are read live, not from the customer's rows
+        self.client.post(f"/tickets/{ticket_ids[0]}/inventory/{item_id}/reserve", json={"quantity": 1})
+        assert self.client.get(f"/customers/{customer_id}/summary").json["parts_cost"] == 20.0
+        assert self.client.put(f"/inventory/{item_id}", json={"price": 99.0}).status_code == 200
+        self.client.put(f"/mechanics/{first}", json={"name": "Renamed Regular"})
+        response = self.client.get(f"/customers/{customer_id}/summary")
+        assert response.json["parts_cost"] == 99.0
+        assert response.json["top_mechanics"][0]["name"] == "Renamed Regular"
+        assert self.client.delete(f"/inventory/{item_id}").status_code == 200
+        assert self.client.get(f"/customers/{customer_id}/summary").json["parts_cost"] == 0.0
+
+    def test_customer_summary_invalid_params(self):
+        # Negative Test: Unknown customer and out-of-range top
+        assert self.client.get("/customers/999999/summary").status_code == 404
+        assert self.client.get("/customers/1/summary?top=0").status_code == 400
@@ -0,0 +1,68 @@
+from sqlalchemy import text
+from App import create_app, db
+from App.models import Inventory, Mechanics
+from App.utils.migrations import upgrade_schema
+
+# The tables as the first release created them, before any added column
+BASELINE_SCHEMA = """
+CREATE TABLE customers (customer_id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL UNIQUE, address VARCHAR(255) NOT NULL,
+    phone VARCHAR(20) NOT NULL, password_hash VARCHAR(255) NOT NULL);
+CREATE TABLE mechanics (mechanic_id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL,
+    address VARCHAR(255) NOT NULL, salary FLOAT NOT NULL);
+CREATE TABLE inventory (item_id INTEGER PRIMARY KEY, item_name VARCHAR(255) NOT NULL,
+    quantity INTEGER NOT NULL, price FLOAT NOT NULL);
+CREATE TABLE service_ticket (ticket_id INTEGER PRIMARY KEY, description VARCHAR(255) NOT NULL,
+    date DATETIME NOT NULL, customer_id INTEGER NOT NULL REFERENCES customers (customer_id));
+CREATE TABLE service_mechanics (ticket_id INTEGER NOT NULL REFERENCES service_ticket (ticket_id),
+    mechanic_id INTEGER NOT NULL REFERENCES mechanics (mechanic_id), PRIMARY KEY (ticket_id, mechanic_id));
+CREATE TABLE inventory_tickets (ticket_id INTEGER NOT NULL REFERENCES service_ticket (ticket_id),
+    item_id INTEGER NOT NULL REFERENCES inventory (item_id), PRIMARY KEY (ticket_id, item_id));
+INSERT INTO customers VALUES (1, 'Old Customer', 'old@example.com', '1 Old St', '555-0100', 'x');
+INSERT INTO mechanics VALUES (1, 'Old Mechanic', '2 Old St', 40000);
+INSERT INTO inventory VALUES (1, 'Old Part', 3, 12.5);
+INSERT INTO service_ticket VALUES (1, 'Old ticket', '2024-05-01 09:00:00', 1);
+INSERT INTO service_mechanics VALUES (1, 1);
+INSERT INTO inventory_tickets VALUES (1, 1);
+"""
+
+
+class TestUpgradeSchema:
+    @classmethod
+    def setup_class(cls):
+        cls.app = create_app("testing")
+        cls.client = cls.app.test_client()
+        with cls.app.app_context():
+            db.drop_all()
+            with db.engine.begin() as connection:
+                for statement in BASELINE_SCHEMA.split(";"):
+                    if statement.strip():
+                        connection.execute(text(statement))
+
+    @classmethod
+    def teardown_class(cls):
+        with cls.app.app_context():
+            db.drop_all()
+
+    def test_upgrade_adds_columns_and_backfills(self):
+        # Positive Test: An old database gets the new columns, counters and sync log, and a rerun is a no-op
+        with self.app.app_context():
+            statements = upgrade_schema()
+            assert "ALTER TABLE mechanics ADD COLUMN ticket_count INTEGER DEFAULT 0 NOT NULL" in statements
+            assert upgrade_schema() == []
+
+            mechanic = db.session.get(Mechanics, 1)
+            assert mechanic.ticket_count == 1
+            item = db.session.get(Inventory, 1)
+            assert (item.sku, item.reorder_point, item.low_stock, item.version) == (None, 0, False, 1)
+
+        response = self.client.get("/sync/")
+        assert response.status_code == 200
+        entities = {(c["entity"], tuple(c["key"].values())) for c in response.json["changes"]}
+        assert entities >= {
+            ("service_ticket", (1,)), ("mechanics", (1,)), ("inventory", (1,)),
+            ("service_mechanics", (1, 1)), ("inventory_tickets", (1, 1))
+        }
+
+        response = self.client.get("/inventory/low-stock")
+        assert response.status_code == 200
@@ -0,0 +1,56 @@
+from datetime import datetime
+from App import create_app, db
+from App.models import Customer, Mechanics, ServiceTicket
+
+
+class TestReportRoutes:
+    @classmethod
+    def setup_class(cls):
+        cls.app = create_app("testing")
+        cls.client = cls.app.test_client()
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def teardown_class(cls):
+        with cls.app.app_context():
+            db.drop_all()
+
+    def test_labour_cost_splits_monthly_pay_over_tickets(self):
+        # Positive Test: Monthly pay is spread over each mechanic's tickets that month
+        with self.app.app_context():
+            customer = Customer(name="Finance Fay", email="finance@example.com",
+                                address="1 Ledger Rd", phone="555", password_hash="x")
+            senior = Mechanics(name="Senior Sam", address="2 Bay St", salary=60000)  # 5000 a month
+            junior = Mechanics(name="Junior Jo", address="3 Bay St", salary=36000)   # 3000 a month
+            db.session.add_all([
+                ServiceTicket(description="Shared job", date=datetime(2017, 6, 5),
+                              customer=customer, mechanics=[senior, junior]),
+                ServiceTicket(description="Senior solo", date=datetime(2017, 6, 20),
+                              customer=customer, mechanics=[senior]),
+                ServiceTicket(description="Next month", date=datetime(2017, 7, 1),
+                              customer=customer, mechanics=[junior]),
+            ])
+            db.session.commit()
+            senior_id, junior_id = senior.mechanic_id, junior.mechanic_id
+
+        response = self.client.get("/reports/labour-cost?period=2017-06")
+        assert response.status_code == 200
+        report = response.json
+        assert report["by_month"] == [
+            {"month": "2017-06", "labour_cost": 8000.0, "tickets": 2, "cost_per_ticket": 4000.0}
+        ]
+        by_mechanic = {row["mechanic_id"]: row for row in report["by_mechanic"]}
+        assert by_mechanic[senior_id]["cost_per_ticket"] == 2500.0
+        assert by_mechanic[junior_id]["cost_per_ticket"] == 3000.0
+        # Shared job: 2500 + 3000; senior solo: 2500
+        assert report["total"]["max_ticket_cost"] == 5500.0
+        assert report["total"]["median_ticket_cost"] == 4000.0
+
+        response = self.client.get("/reports/labour-cost?period=2017")
+        assert [row["month"] for row in response.json["by_month"]] == ["2017-06", "2017-07"]
+        assert response.json["total"]["labour_cost"] == 11000.0
+
+    def test_labour_cost_invalid_period(self):
+        # Negative Test: Periods other than YYYY or YYYY-MM are rejected
+        assert self.client.get("/reports/labour-cost?period=last-year").status_code == 400
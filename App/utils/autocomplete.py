@@ -0,0 +1,139 @@
+import threading
+from bisect import bisect_left, insort
+from flask import current_app
+from sqlalchemy import func, select
+from App.extensions import db
+from App.models import ChangeLogCompaction, Inventory
+from App.utils.cache_tags import tag_versions
+from App.utils.changelog import log_position, read_log
+
+
+class PrefixIndex:
+    """
+    Sorted array of ``(key, item_id)`` searched with bisect. Every word of a
+    name starts a key ("front brake pads" is found by "bra" and "pad"), and
+    keys are lower-cased, so lookups cost O(log n + results).
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._keys = {}   # item_id -> its keys, for removal
+        self._names = {}  # item_id -> display name
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def keys_for(name):
+        words = name.lower().split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def load(self, rows):
+        entries, keys, names = [], {}, {}
+        for item_id, name in rows:
+            keys[item_id] = self.keys_for(name)
+            names[item_id] = name
+            entries.extend((key, item_id) for key in keys[item_id])
+        entries.sort()
+        with self._lock:
+            self._entries, self._keys, self._names = entries, keys, names
+
+    def upsert(self, item_id, name):
+        with self._lock:
+            if self._names.get(item_id) == name:
+                return
+            self._remove(item_id)
+            self._keys[item_id] = self.keys_for(name)
+            self._names[item_id] = name
+            for key in self._keys[item_id]:
+                insort(self._entries, (key, item_id))
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id):
+        for key in self._keys.pop(item_id, ()):
+            del self._entries[bisect_left(self._entries, (key, item_id))]
+        self._names.pop(item_id, None)
+
+    def suggest(self, prefix, limit):
+        prefix = " ".join(prefix.lower().split())
+        results, seen = [], set()
+        if not prefix:
+            return results
+        with self._lock:
+            i = bisect_left(self._entries, (prefix,))
+            while i < len(self._entries) and len(results) < limit:
+                key, item_id = self._entries[i]
+                if not key.startswith(prefix):
+                    break
+                if item_id not in seen:
+                    seen.add(item_id)
+                    results.append({"item_id": item_id, "item_name": self._names[item_id]})
+                i += 1
+        return results
+
+
+class InventorySuggestions:
+    """
+    A PrefixIndex over Inventory.item_name for one app in one process.
+
+    Built on first use, then kept current from the change log, which every
+    Inventory insert, update and delete feeds (ORM events and Core writes
+    alike, from any worker). The log is only read after the ``inventory``
+    cache tag moves, so between writes a lookup is one cache read and never
+    touches the database.
+    """
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self._ready = False
+        self._tag_version = None
+        self._last_change_id = 0
+        self._sync_lock = threading.Lock()
+
+    def suggest(self, prefix, limit):
+        self._refresh()
+        return self.index.suggest(prefix, limit)
+
+    def _refresh(self):
+        tag_version = tag_versions(["inventory"])[0]
+        if self._ready and tag_version == self._tag_version:
+            return
+
+        with self._sync_lock:
+            if self._ready and tag_version == self._tag_version:
+                return
+            horizon = db.session.scalar(select(func.max(ChangeLogCompaction.compacted_through)))
+            if not self._ready or (horizon is not None and self._last_change_id < horizon):
+                self._rebuild()
+            else:
+                self._apply_log()
+            self._tag_version = tag_version
+            self._ready = True
+
+    def _rebuild(self):
+        # Read the log position first, so changes made during the load are replayed
+        self._last_change_id = log_position()
+        self.index.load(db.session.execute(select(Inventory.item_id, Inventory.item_name)).all())
+
+    def _apply_log(self):
+        entries, self._last_change_id, _ = read_log(self._last_change_id, [Inventory.__tablename__])
+        if not entries:
+            return
+
+        item_ids = {int(entry.entity_id) for entry in entries}
+        names = dict(db.session.execute(
+            select(Inventory.item_id, Inventory.item_name).where(Inventory.item_id.in_(item_ids))
+        ).all())
+        for item_id in item_ids:
+            if item_id in names:
+                self.index.upsert(item_id, names[item_id])
+            else:
+                self.index.remove(item_id)
+
+
+def inventory_suggestions():
+    """
+    The current app's suggestion index (one per app, so per worker process).
+    """
+    return current_app.extensions.setdefault("inventory_suggestions", InventorySuggestions())
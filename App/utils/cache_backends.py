@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from flask_caching.backends.base import BaseCache
+from werkzeug.utils import import_string
+
+
+class TieredCache(BaseCache):
+    """
+    A bounded in-process LRU (L1) in front of a cache shared by every worker
+    (L2): Redis in production, a FileSystemCache directory locally and in tests.
+
+    Reads hit L1 first and fall back to L2, promoting what they find. Writes go
+    to both. Keys starting with one of ``bypass_prefixes`` skip L1 entirely:
+    they are mutable (e.g. the ``tag/`` version tokens), so every worker must
+    see the shared value. All other keys are expected to be immutable for their
+    lifetime (the tagged view keys embed their versions), which is what makes
+    caching them per process safe. ``l1_timeout`` caps how long anything else
+    can linger in L1 after another worker changes it.
+    """
+
+    def __init__(self, l2, l1_size=1024, l1_timeout=60, bypass_prefixes=("tag/",), default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        self.l2 = l2
+        self.l1_size = l1_size
+        self.l1_timeout = l1_timeout
+        self.bypass_prefixes = tuple(bypass_prefixes)
+        self._l1 = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        l2_type = config.get("CACHE_L2_TYPE", "FileSystemCache")
+        if "." not in l2_type:
+            l2_type = "flask_caching.backends." + l2_type
+        l2 = import_string(l2_type).factory(app, config, list(args), dict(kwargs))
+        return cls(
+            l2,
+            l1_size=config.get("CACHE_L1_SIZE", 1024),
+            l1_timeout=config.get("CACHE_L1_TIMEOUT", 60),
+            bypass_prefixes=config.get("CACHE_L1_BYPASS_PREFIXES", ("tag/",)),
+            **kwargs
+        )
+
+    # L1 helpers ---------------------------------------------------------
+
+    def _l1_eligible(self, key):
+        return self.l1_size > 0 and not key.startswith(self.bypass_prefixes)
+
+    def _l1_get(self, key):
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return value
+
+    def _l1_set(self, key, value, timeout=None):
+        if not self._l1_eligible(key):
+            return
+        timeout = self._normalize_timeout(timeout)
+        ttl = min(timeout, self.l1_timeout) if timeout else self.l1_timeout
+        with self._lock:
+            self._l1[key] = (value, time.monotonic() + ttl)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_size:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._l1.pop(key, None)
+
+    # Cache API ----------------------------------------------------------
+
+    def get(self, key):
+        if self._l1_eligible(key):
+            value = self._l1_get(key)
+            if value is not None:
+                return value
+        value = self.l2.get(key)
+        if value is not None:
+            self._l1_set(key, value)
+        return value
+
+    def get_many(self, *keys):
+        values = {key: self._l1_get(key) if self._l1_eligible(key) else None for key in keys}
+        misses = [key for key in keys if values[key] is None]
+        if misses:
+            for key, value in zip(misses, self.l2.get_many(*misses)):
+                values[key] = value
+                if value is not None:
+                    self._l1_set(key, value)
+        return [values[key] for key in keys]
+
+    def set(self, key, value, timeout=None):
+        result = self.l2.set(key, value, timeout=timeout)
+        self._l1_set(key, value, timeout)
+        return result
+
+    def set_many(self, mapping, timeout=None):
+        result = self.l2.set_many(mapping, timeout=timeout)
+        for key, value in mapping.items():
+            self._l1_set(key, value, timeout)
+        return result
+
+    def add(self, key, value, timeout=None):
+        added = self.l2.add(key, value, timeout=timeout)
+        if added:
+            self._l1_set(key, value, timeout)
+        return added
+
+    def has(self, key):
+        return (self._l1_eligible(key) and self._l1_get(key) is not None) or self.l2.has(key)
+
+    def delete(self, key):
+        self._l1_delete(key)
+        return self.l2.delete(key)
+
+    def delete_many(self, *keys):
+        self._l1_delete(*keys)
+        return self.l2.delete_many(*keys)
+
+    def inc(self, key, delta=1):
+        self._l1_delete(key)
+        return self.l2.inc(key, delta=delta)
+
+    def dec(self, key, delta=1):
+        self._l1_delete(key)
+        return self.l2.dec(key, delta=delta)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        return self.l2.clear()
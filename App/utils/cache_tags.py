@@ -0,0 +1,150 @@
+import hashlib
+import uuid
+from functools import wraps
+from itertools import chain
+from flask import current_app, g, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.interfaces import MANYTOONE
+from App.extensions import cache, db
+
+TAG_KEY = "tag/{}"
+
+
+# ---------------------------------------------------------
+# CACHED VIEWS
+# ---------------------------------------------------------
+def cached_view(*tags, timeout=None):
+    """
+    Cache a view's successful responses under entity tags.
+
+    Tags name what the payload depends on: a table (``"mechanics"``) or one
+    row (``"mechanics:{mechanic_id}"``, formatted with the view's URL
+    arguments). A row view also listing ``"mechanics:*"`` follows bulk
+    changes, which bump that one tag instead of a tag per row. Every tag has a version token stored in the cache, and the
+    entry key includes those versions. Bumping a tag on commit orphans every
+    entry that used it, so entries can live for hours without going stale.
+
+    Keys cover the path, the query string and the authenticated customer
+    (when the view sits under ``token_required``), so pages and per-user
+    responses never collide.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            versions = tag_versions([tag.format(**kwargs) for tag in tags])
+            customer_id = g.get("customer_id")
+            key = "view/" + hashlib.sha1(
+                "|".join([request.full_path, str(customer_id or ""), *versions]).encode()
+            ).hexdigest()
+
+            cached = cache.get(key)
+            if cached is not None:
+                data, status, mimetype = cached
+                return current_app.response_class(data, status=status, mimetype=mimetype)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(
+                    key,
+                    (response.get_data(), response.status_code, response.mimetype),
+                    timeout=timeout or current_app.config["CACHE_VIEW_TIMEOUT"]
+                )
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def tag_versions(tags):
+    """
+    Current version token of each tag. A missing token (never set, or evicted)
+    gets a fresh random one, which can never match an older entry.
+    """
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = list(cache.get_many(*keys)) if keys else []
+    missing = {key: uuid.uuid4().hex for key, version in zip(keys, versions) if version is None}
+    if missing:
+        cache.set_many(missing, timeout=0)
+    return [version or missing[key] for key, version in zip(keys, versions)]
+
+
+def invalidate(tags):
+    """
+    Orphan every cached view that depends on any of ``tags``.
+    """
+    if tags:
+        cache.set_many({TAG_KEY.format(tag): uuid.uuid4().hex for tag in tags}, timeout=0)
+
+
+# ---------------------------------------------------------
+# INVALIDATION FROM SESSION EVENTS
+# ---------------------------------------------------------
+def mark_stale(*tags, session=None):
+    """
+    Queue tags for invalidation when the current transaction commits. ORM
+    changes are tracked automatically; Core statements that bypass the unit
+    of work (bulk inserts, junction-table writes) report their tags here.
+    """
+    session = session or db.session()
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+
+def entity_tags(obj):
+    """
+    Tags touched by a flushed ORM instance: its table, its row, the parent
+    row of each many-to-one, and both ends of any changed many-to-many link.
+    """
+    state = inspect(obj)
+    mapper = state.mapper
+    table = mapper.local_table.name
+    tags = {table}
+    tags.update(_row_tags(table, mapper.primary_key_from_instance(obj)))
+
+    for relationship in mapper.relationships:
+        if relationship.secondary is not None:
+            history = attributes.get_history(
+                obj, relationship.key, passive=attributes.PASSIVE_NO_INITIALIZE
+            )
+            changed = list(history.added or ()) + list(history.deleted or ())
+            if state.deleted or state.was_deleted:
+                changed += list(history.unchanged or ())
+            if changed or state.deleted or state.was_deleted:
+                tags.add(relationship.secondary.name)
+            for related in changed:
+                related_mapper = inspect(related).mapper
+                tags.update(_row_tags(
+                    related_mapper.local_table.name, related_mapper.primary_key_from_instance(related)
+                ))
+        elif relationship.direction is MANYTOONE:
+            parent = relationship.mapper.local_table.name
+            for local, _ in relationship.local_remote_pairs:
+                key = mapper.get_property_by_column(local).key
+                for value in attributes.get_history(obj, key).sum():
+                    if value is not None:
+                        tags.add(f"{parent}:{value}")
+    return tags
+
+
+def _row_tags(table, primary_key):
+    if any(value is None for value in primary_key):
+        return set()
+    return {f"{table}:" + ":".join(str(value) for value in primary_key)}
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_flushed_tags(session, flush_context):
+    tags = session.info.setdefault("cache_tags", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tags.update(entity_tags(obj))
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_committed_tags(session):
+    invalidate(session.info.pop("cache_tags", None))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_rolled_back_tags(session):
+    session.info.pop("cache_tags", None)
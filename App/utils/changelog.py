@@ -0,0 +1,256 @@
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, inspect, select, tuple_
+from sqlalchemy.orm import attributes
+from App.extensions import db
+from App.models import (
+    ChangeLog, ChangeLogCompaction, Inventory, Mechanics, ServiceTicket,
+    inventory_tickets, service_mechanics
+)
+
+# Tables the mobile app mirrors. Deleting a ticket, mechanic or item implies
+# deleting its links, so those are not logged separately.
+SYNCED_TABLES = {
+    table.name: table
+    for table in (ServiceTicket.__table__, Mechanics.__table__, Inventory.__table__,
+                  service_mechanics, inventory_tickets)
+}
+
+
+class ResyncRequired(Exception):
+    """
+    Raised when a sync token predates deletes that compaction has discarded.
+    """
+
+
+# ---------------------------------------------------------
+# WRITING THE LOG
+# ---------------------------------------------------------
+def log_changes(table, keys, operation, session=None):
+    """
+    Append changes made by Core statements that bypass the unit of work
+    (bulk inserts, junction-table writes). ``keys`` are primary key values,
+    or tuples in primary key column order for a junction table.
+    """
+    rows = [
+        {"entity": table.name, "entity_id": _entity_id(key), "operation": operation}
+        for key in keys
+    ]
+    if rows:
+        (session or db.session()).execute(insert(ChangeLog.__table__), rows)
+
+
+def _entity_id(key):
+    return ":".join(str(value) for value in key) if isinstance(key, tuple) else str(key)
+
+
+@event.listens_for(db.session, "after_flush")
+def _log_flushed_changes(session, flush_context):
+    # Keyed by row so both sides of a bidirectional link log it once
+    changes = {}
+    for operation, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            mapper = inspect(obj).mapper
+            table = mapper.local_table
+            if table.name in SYNCED_TABLES and (
+                    operation != "update" or session.is_modified(obj, include_collections=False)):
+                changes[(table.name, _entity_id(mapper.primary_key_from_instance(obj)[0]))] = operation
+            if operation != "delete":
+                changes.update(_link_changes(obj, mapper))
+
+    if changes:
+        session.connection().execute(insert(ChangeLog.__table__), [
+            {"entity": entity, "entity_id": entity_id, "operation": operation}
+            for (entity, entity_id), operation in changes.items()
+        ])
+
+
+def _link_changes(obj, mapper):
+    parent_id = mapper.primary_key_from_instance(obj)[0]
+    for relationship in mapper.relationships:
+        secondary = relationship.secondary
+        if secondary is None or secondary.name not in SYNCED_TABLES:
+            continue
+        _, local_link = relationship.synchronize_pairs[0]
+        _, remote_link = relationship.secondary_synchronize_pairs[0]
+        history = attributes.get_history(obj, relationship.key, passive=attributes.PASSIVE_NO_INITIALIZE)
+        for operation, related_objects in (("insert", history.added), ("delete", history.deleted)):
+            for related in related_objects or ():
+                link = {
+                    local_link.name: parent_id,
+                    remote_link.name: inspect(related).mapper.primary_key_from_instance(related)[0]
+                }
+                key = tuple(link[column.name] for column in secondary.primary_key.columns)
+                yield (secondary.name, _entity_id(key)), operation
+
+
+# ---------------------------------------------------------
+# READING THE LOG
+# ---------------------------------------------------------
+def read_log(since, entities=(), limit=None):
+    """
+    Entries logged after ``since`` in change_id order, at most ``limit``
+    read, only those of ``entities`` if any are given.
+
+    Returns ``(entries, position, has_more)``; read from ``position`` next
+    time. change_ids are handed out when a transaction writes, not when it
+    commits. SQLite has a single writer, so its ids become visible in order
+    and ``position`` is the last entry read. On other databases a lower id
+    can commit after a higher one is visible, so ``position`` stops short of
+    any gap in the ids followed by an entry younger than
+    SYNC_COMMIT_GRACE_SECONDS. The entries past it are read again next time,
+    so applying them must be idempotent. An older gap is taken for a rollback;
+    a transaction open longer than the grace period can still be missed.
+    """
+    in_commit_order = _ids_commit_in_order()
+    query = select(ChangeLog).where(ChangeLog.change_id > since).order_by(ChangeLog.change_id)
+    if entities and in_commit_order:
+        query = query.where(ChangeLog.entity.in_(entities))
+    if limit is not None:
+        query = query.limit(limit + 1)
+    entries = db.session.scalars(query).all()
+    has_more = limit is not None and len(entries) > limit
+    entries = entries[:limit]
+
+    if in_commit_order:
+        return entries, entries[-1].change_id if entries else since, has_more
+
+    position = _resume_after(since, entries, _settled_before())
+    if position != (entries[-1].change_id if entries else since):
+        has_more = False  # Wait for the gap to fill rather than re-reading at once
+    if entities:
+        entries = [entry for entry in entries if entry.entity in entities]
+    return entries, position, has_more
+
+
+def log_position():
+    """
+    Where an in-memory copy loaded from the tables now should start reading
+    the log: its end on SQLite; elsewhere the last entry older than the grace
+    period, so changes that may still be committing are replayed.
+    """
+    query = select(func.max(ChangeLog.change_id))
+    if not _ids_commit_in_order():
+        query = query.where(ChangeLog.changed_at < _settled_before())
+    return db.session.scalar(query) or 0
+
+
+def _ids_commit_in_order():
+    return db.session.get_bind().dialect.name == "sqlite"
+
+
+def _settled_before():
+    return datetime.utcnow() - timedelta(seconds=current_app.config["SYNC_COMMIT_GRACE_SECONDS"])
+
+
+def _resume_after(since, entries, settled_before):
+    # The last id before the first gap that may still be filled by a late commit
+    position = since
+    for entry in entries:
+        if entry.change_id != position + 1 and entry.changed_at >= settled_before:
+            break
+        position = entry.change_id
+    return position
+
+
+def changes_since(since, limit):
+    """
+    Changes logged after ``since`` (a change_id; 0 replays the whole log),
+    at most ``limit`` entries read. A row changed several times in that span
+    is reported once, with its latest state; ``insert`` and ``update`` both
+    carry the current row and should be applied as upserts (outside SQLite
+    the latest entries may be sent again, see ``read_log``).
+
+    Returns ``(changes, last_change_id, has_more)``.
+    """
+    if since:
+        horizon = db.session.scalar(select(func.max(ChangeLogCompaction.compacted_through)))
+        if horizon is not None and since < horizon:
+            raise ResyncRequired("Sync token is older than the change log; full resync required")
+
+    entries, last_change_id, has_more = read_log(since, limit=limit)
+
+    latest = {}
+    for entry in entries:
+        latest.pop((entry.entity, entry.entity_id), None)
+        latest[(entry.entity, entry.entity_id)] = entry
+
+    rows = _current_rows(entry for entry in latest.values() if entry.operation != "delete")
+    changes = []
+    for (entity, entity_id), entry in latest.items():
+        table = SYNCED_TABLES[entity]
+        key = _parse_key(table, entity_id)
+        operation, data = entry.operation, None
+        if operation != "delete":
+            data = rows.get((entity, entity_id))
+            if data is None:
+                operation = "delete"  # Deleted again after this entry; its tombstone is on a later page
+        changes.append({
+            "change_id": entry.change_id,
+            "entity": entity,
+            "key": key,
+            "operation": operation,
+            "data": data
+        })
+
+    return changes, last_change_id, has_more
+
+
+def _parse_key(table, entity_id):
+    columns = list(table.primary_key.columns)
+    values = entity_id.split(":")
+    return {column.name: column.type.python_type(value) for column, value in zip(columns, values)}
+
+
+def _current_rows(entries):
+    """
+    Current column values of every logged row, one IN query per table
+    (a row-value IN for the junction tables' composite keys).
+    """
+    ids_by_entity = {}
+    for entry in entries:
+        ids_by_entity.setdefault(entry.entity, set()).add(entry.entity_id)
+
+    rows = {}
+    for entity, entity_ids in ids_by_entity.items():
+        table = SYNCED_TABLES[entity]
+        columns = list(table.primary_key.columns)
+        keys = [tuple(_parse_key(table, entity_id).values()) for entity_id in entity_ids]
+        for row in db.session.execute(select(table).where(tuple_(*columns).in_(keys))).mappings():
+            rows[(entity, _entity_id(tuple(row[column.name] for column in columns)))] = {
+                name: value.isoformat() if isinstance(value, (date, datetime)) else value
+                for name, value in row.items()
+            }
+    return rows
+
+
+# ---------------------------------------------------------
+# COMPACTION
+# ---------------------------------------------------------
+def compact_change_log(retention=None):
+    """
+    Keep the log bounded: drop every entry superseded by a later one for the
+    same row, then tombstones older than ``retention``. The log then holds at
+    most one entry per live row plus recent deletes. Tokens older than the
+    newest dropped tombstone get ResyncRequired. Returns the entries removed.
+    """
+    if retention is None:
+        retention = timedelta(days=current_app.config["SYNC_TOMBSTONE_RETENTION_DAYS"])
+
+    latest = select(func.max(ChangeLog.change_id)).group_by(ChangeLog.entity, ChangeLog.entity_id)
+    removed = db.session.execute(delete(ChangeLog).where(ChangeLog.change_id.not_in(latest))).rowcount
+
+    horizon = db.session.scalar(
+        select(func.max(ChangeLog.change_id)).where(
+            ChangeLog.operation == "delete",
+            ChangeLog.changed_at < datetime.utcnow() - retention
+        )
+    )
+    if horizon is not None:
+        removed += db.session.execute(
+            delete(ChangeLog).where(ChangeLog.operation == "delete", ChangeLog.change_id <= horizon)
+        ).rowcount
+        db.session.add(ChangeLogCompaction(compacted_through=horizon))
+
+    db.session.commit()
+    return removed
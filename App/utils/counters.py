@@ -0,0 +1,191 @@
+from collections import Counter
+from datetime import date
+from sqlalchemy import String, bindparam, cast, delete, event, func, insert, select, update
+from sqlalchemy.orm import attributes
+from App.extensions import db
+from App.models import Mechanics, ServiceTicket, mechanic_ticket_rollups, service_mechanics
+from App.utils.cache_tags import mark_stale
+from App.utils.changelog import log_changes
+from App.utils.upserts import insert_or_add
+from App.utils.versioning import touch_rows
+
+# Mechanics.ticket_count and mechanic_ticket_rollups are kept in step with
+# service_mechanics inside the transaction that changes it, so reading a
+# leaderboard never aggregates the junction table. Core junction writes
+# report the links they actually changed through count_links; ORM changes
+# are picked up from the session below.
+
+
+def month_of(when):
+    """
+    Rollup period of a ticket date: the first day of its month (None if undated).
+    """
+    return when.date().replace(day=1) if when else None
+
+
+def count_links(links, delta, session=None):
+    """
+    Add ``delta`` (+1 linked, -1 unlinked) to the counters of every
+    ``(mechanic_id, ticket_date)`` link: one executemany per table.
+    """
+    session = session or db.session()
+    per_mechanic = Counter()
+    per_period = Counter()
+    for mechanic_id, ticket_date in links:
+        per_mechanic[mechanic_id] += delta
+        per_period[(mechanic_id, month_of(ticket_date))] += delta
+    _apply(session, per_mechanic, per_period)
+
+
+def count_ticket_links(ticket_ids, delta, session=None):
+    """
+    Add ``delta`` to the counters of every link of the tickets selected by
+    ``ticket_ids`` (a SELECT of ticket ids), e.g. before one DELETE drops
+    them all. Links are grouped per mechanic and month in SQL, so none are
+    fetched. Returns the ids of the mechanics whose counters moved.
+    """
+    session = session or db.session()
+    # ISO text, so the month is its "YYYY-MM" prefix (as in the labour report)
+    month = func.substr(cast(ServiceTicket.date, String), 1, 7)
+    per_mechanic = Counter()
+    per_period = Counter()
+    for mechanic_id, ticket_month, links in session.execute(
+        select(service_mechanics.c.mechanic_id, month, func.count())
+        .join(ServiceTicket, ServiceTicket.ticket_id == service_mechanics.c.ticket_id)
+        .where(service_mechanics.c.ticket_id.in_(ticket_ids))
+        .group_by(service_mechanics.c.mechanic_id, month)
+    ):
+        per_mechanic[mechanic_id] += delta * links
+        if ticket_month:
+            per_period[(mechanic_id, date.fromisoformat(ticket_month + "-01"))] += delta * links
+    _apply(session, per_mechanic, per_period)
+    return set(per_mechanic)
+
+
+def _apply(session, per_mechanic, per_period):
+    per_mechanic = {mechanic_id: d for mechanic_id, d in per_mechanic.items() if d}
+    per_period = {(mechanic_id, period): d for (mechanic_id, period), d in per_period.items() if d and period}
+    if not per_mechanic and not per_period:
+        return
+
+    connection = session.connection()
+    mechanics = Mechanics.__table__
+    if per_mechanic:
+        connection.execute(
+            update(mechanics)
+            .where(mechanics.c.mechanic_id == bindparam("m_id"))
+            .values(ticket_count=mechanics.c.ticket_count + bindparam("delta")),
+            [{"m_id": mechanic_id, "delta": d} for mechanic_id, d in per_mechanic.items()]
+        )
+        log_changes(mechanics, per_mechanic, "update", session=session)
+    if per_period:
+        connection.execute(
+            insert_or_add(mechanic_ticket_rollups, mechanic_ticket_rollups.c.ticket_count),
+            [
+                {"mechanic_id": mechanic_id, "period": period, "ticket_count": d}
+                for (mechanic_id, period), d in per_period.items()
+            ]
+        )
+        # Leaderboards are cached under "mechanics"; a re-dated ticket moves only rollups
+        mark_stale("mechanics", session=session)
+
+
+def rebuild_ticket_counters():
+    """
+    Recompute every counter and rollup from service_mechanics, for
+    databases that predate them or to repair drift. Safe to run repeatedly.
+    """
+    mechanics = Mechanics.__table__
+    linked = (
+        select(func.count())
+        .where(service_mechanics.c.mechanic_id == mechanics.c.mechanic_id)
+        .scalar_subquery()
+    )
+    db.session.execute(update(mechanics).values(ticket_count=linked))
+
+    db.session.execute(delete(mechanic_ticket_rollups))
+    per_period = Counter(
+        (mechanic_id, month_of(ticket_date))
+        for mechanic_id, ticket_date in db.session.execute(
+            select(service_mechanics.c.mechanic_id, ServiceTicket.date)
+            .join(ServiceTicket, ServiceTicket.ticket_id == service_mechanics.c.ticket_id)
+        )
+    )
+    if per_period:
+        db.session.execute(insert(mechanic_ticket_rollups), [
+            {"mechanic_id": mechanic_id, "period": period, "ticket_count": count}
+            for (mechanic_id, period), count in per_period.items()
+        ])
+    mechanic_ids = db.session.scalars(select(mechanics.c.mechanic_id)).all()
+    touch_rows(Mechanics, mechanic_ids)
+    log_changes(mechanics, mechanic_ids, "update")
+    db.session.commit()
+
+
+# ---------------------------------------------------------
+# ORM CHANGES
+# ---------------------------------------------------------
+@event.listens_for(db.session, "before_flush")
+def _count_rows_about_to_change(session, flush_context, instances):
+    """
+    Links that the flush will drop or re-date without them being in any
+    loaded collection: those of deleted tickets, and every link of a ticket
+    whose date moves to another month. Read now, while they still exist.
+    """
+    per_mechanic, per_period = session.info.setdefault("ticket_counts", (Counter(), Counter()))
+    deleted = {obj.ticket_id: obj for obj in session.deleted if isinstance(obj, ServiceTicket)}
+    redated = {}
+    for obj in session.dirty:
+        if isinstance(obj, ServiceTicket) and obj not in session.deleted:
+            history = attributes.get_history(obj, "date")
+            if history.deleted and history.added and month_of(history.deleted[0]) != month_of(history.added[0]):
+                redated[obj.ticket_id] = (history.deleted[0], history.added[0])
+
+    if not deleted and not redated:
+        return
+    links = session.execute(
+        select(service_mechanics.c.ticket_id, service_mechanics.c.mechanic_id)
+        .where(service_mechanics.c.ticket_id.in_(deleted.keys() | redated.keys()))
+    ).all()
+    for ticket_id, mechanic_id in links:
+        if ticket_id in deleted:
+            per_mechanic[mechanic_id] -= 1
+            per_period[(mechanic_id, month_of(deleted[ticket_id].date))] -= 1
+        else:
+            old, new = redated[ticket_id]
+            per_period[(mechanic_id, month_of(old))] -= 1
+            per_period[(mechanic_id, month_of(new))] += 1
+
+
+@event.listens_for(db.session, "after_flush")
+def _count_flushed_links(session, flush_context):
+    """
+    Links added to or removed from a loaded collection, on either side,
+    counted once each now that new rows have their ids.
+    """
+    per_mechanic, per_period = session.info.pop("ticket_counts", (Counter(), Counter()))
+    seen = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ServiceTicket):
+            key, ticket_of, mechanic_of = "mechanics", (lambda other: obj), (lambda other: other)
+        elif isinstance(obj, Mechanics):
+            key, ticket_of, mechanic_of = "tickets", (lambda other: other), (lambda other: obj)
+        else:
+            continue
+        history = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+        for delta, others in ((1, history.added), (-1, history.deleted)):
+            for other in others or ():
+                ticket, mechanic = ticket_of(other), mechanic_of(other)
+                link = (ticket.ticket_id, mechanic.mechanic_id)
+                # Links of deleted rows were counted before the flush, or never existed
+                if link in seen or ticket in session.deleted or mechanic in session.deleted:
+                    continue
+                seen.add(link)
+                per_mechanic[mechanic.mechanic_id] += delta
+                per_period[(mechanic.mechanic_id, month_of(ticket.date))] += delta
+    _apply(session, per_mechanic, per_period)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_counts(session):
+    session.info.pop("ticket_counts", None)
@@ -0,0 +1,58 @@
+from sqlalchemy import delete, select
+from App.extensions import db
+from App.models import Customer, Inventory, Mechanics, ServiceTicket, inventory_tickets, service_mechanics
+from App.utils.cache_tags import mark_stale
+from App.utils.changelog import SYNCED_TABLES, log_changes
+from App.utils.counters import count_ticket_links
+from App.utils.versioning import touch_rows
+
+# Deletes are single statements: the database removes dependent rows through
+# ON DELETE CASCADE, so neither the row nor its children are loaded. Cascaded
+# rows skip the session events, so what they change is reported here first,
+# with a fixed number of set-based statements however many rows cascade.
+
+# Past this many rows, "<table>:*" is bumped instead of one tag per row
+ROW_TAGS_MAX = 100
+
+
+def delete_row(model, row_id):
+    """
+    Delete one row by primary key with a single DELETE and report it.
+    Returns False, having changed nothing, if there is no such row.
+    """
+    table = model.__table__
+    primary_key = table.primary_key.columns[0]
+    if not db.session.execute(delete(table).where(primary_key == row_id)).rowcount:
+        return False
+    mark_stale(table.name, f"{table.name}:{row_id}")
+    if table.name in SYNCED_TABLES:
+        log_changes(table, [row_id], "delete")
+    return True
+
+
+def tickets_deleted(where):
+    """
+    Report the tickets matching ``where``, and the links that go with them,
+    as deleted; call it before the DELETE that removes them, while the links
+    can still be read. Returns the ticket ids.
+    """
+    ticket_ids = db.session.scalars(select(ServiceTicket.ticket_id).where(where)).all()
+    if not ticket_ids:
+        return ticket_ids
+    selected = select(ServiceTicket.ticket_id).where(where)
+
+    # Rows that serialize the tickets change payload: their mechanics, items and customers
+    touch_rows(Mechanics, count_ticket_links(selected, -1))
+    touch_rows(Inventory, db.session.scalars(
+        select(inventory_tickets.c.item_id.distinct()).where(inventory_tickets.c.ticket_id.in_(selected))
+    ))
+    touch_rows(Customer, db.session.scalars(select(ServiceTicket.customer_id.distinct()).where(where)))
+
+    # A ticket's links are implied deleted with it, so only the tickets are logged
+    table = ServiceTicket.__tablename__
+    row_tags = [f"{table}:{ticket_id}" for ticket_id in ticket_ids]
+    if len(row_tags) > ROW_TAGS_MAX:
+        row_tags = [f"{table}:*"]
+    mark_stale(table, service_mechanics.name, inventory_tickets.name, *row_tags)
+    log_changes(ServiceTicket.__table__, ticket_ids, "delete")
+    return ticket_ids
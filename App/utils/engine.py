@@ -0,0 +1,21 @@
+from functools import partial
+from sqlalchemy import event
+from App.extensions import db
+
+
+def configure_engine(app):
+    """
+    Per-connection settings for the app's database engine.
+    """
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", partial(_sqlite_pragmas, app.config["SQLITE_PRAGMAS"]))
+
+
+def _sqlite_pragmas(pragmas, dbapi_connection, connection_record):
+    # Foreign keys (ON DELETE CASCADE included) are off unless each connection opts in
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from itertools import islice
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def import_format(filename=None, mimetype=None):
+    """
+    Guess an upload's format from its file extension, then its content
+    type. None if neither says.
+    """
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension in ("csv", "ndjson", "jsonl"):
+        return "csv" if extension == "csv" else "ndjson"
+    if mimetype in ("text/csv", "application/csv"):
+        return "csv"
+    if mimetype in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def read_rows(stream, file_format):
+    """
+    Lazily yield ``(line_number, row)`` from a binary stream, one line in
+    memory at a time. ``row`` is a dict, or None when the line is unparseable.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Blank cells mean "not given", so required-field checks catch them
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ""}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def batched(iterable, size):
+    """
+    Split ``iterable`` into lists of at most ``size`` items without reading ahead.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,139 @@
+from sqlalchemy import delete, select, tuple_
+from App.extensions import db
+from App.models import Mechanics, ServiceTicket, service_mechanics
+from App.utils.cache_tags import mark_stale
+from App.utils.changelog import log_changes
+from App.utils.counters import count_links
+from App.utils.upserts import insert_ignore
+from App.utils.versioning import touch_rows
+
+
+def existing_mechanic_ids(mechanic_ids):
+    """
+    Return the subset of ``mechanic_ids`` that exist, using one IN query.
+    """
+    mechanic_ids = set(mechanic_ids)
+    if not mechanic_ids:
+        return set()
+    return set(db.session.scalars(
+        select(Mechanics.mechanic_id).where(Mechanics.mechanic_id.in_(mechanic_ids))
+    ))
+
+
+def link_mechanics(ticket_id, mechanic_ids):
+    """
+    Attach ``mechanic_ids`` to a ticket with a single multi-row INSERT.
+    Unknown ids are dropped; already-linked ids are ignored by the database.
+
+    Returns the ids that exist.
+    """
+    mechanic_ids = existing_mechanic_ids(mechanic_ids)
+    if mechanic_ids:
+        rows = [{"ticket_id": ticket_id, "mechanic_id": mechanic_id} for mechanic_id in mechanic_ids]
+        if db.session.get_bind().dialect.insert_executemany_returning:
+            # Skipped duplicates return nothing, so only new links are counted
+            linked = set(db.session.scalars(
+                insert_ignore(service_mechanics).returning(service_mechanics.c.mechanic_id), rows
+            ))
+        else:
+            linked = mechanic_ids - _linked_mechanic_ids(ticket_id, mechanic_ids)
+            db.session.execute(insert_ignore(service_mechanics), rows)
+        _links_changed([(ticket_id, mechanic_id) for mechanic_id in linked], "insert")
+    return mechanic_ids
+
+
+def link_pairs(links):
+    """
+    Insert many ``(ticket_id, mechanic_id)`` links, across tickets, in one
+    executemany. Both ids must exist; already-present links are ignored.
+
+    Returns the links actually inserted.
+    """
+    links = set(links)
+    if not links:
+        return set()
+    rows = [{"ticket_id": ticket_id, "mechanic_id": mechanic_id} for ticket_id, mechanic_id in links]
+    if db.session.get_bind().dialect.insert_executemany_returning:
+        linked = set(db.session.execute(
+            insert_ignore(service_mechanics).returning(service_mechanics.c.ticket_id, service_mechanics.c.mechanic_id),
+            rows
+        ).tuples())
+    else:
+        linked = links - set(db.session.execute(
+            select(service_mechanics.c.ticket_id, service_mechanics.c.mechanic_id)
+            .where(tuple_(service_mechanics.c.ticket_id, service_mechanics.c.mechanic_id).in_(links))
+        ).tuples())
+        db.session.execute(insert_ignore(service_mechanics), rows)
+    _links_changed(linked, "insert")
+    return linked
+
+
+def unlink_mechanics(ticket_id, mechanic_ids):
+    """
+    Detach ``mechanic_ids`` from a ticket with a single DELETE.
+    """
+    mechanic_ids = set(mechanic_ids)
+    if mechanic_ids:
+        stmt = delete(service_mechanics).where(
+            service_mechanics.c.ticket_id == ticket_id,
+            service_mechanics.c.mechanic_id.in_(mechanic_ids)
+        )
+        if db.session.get_bind().dialect.delete_returning:
+            unlinked = set(db.session.scalars(stmt.returning(service_mechanics.c.mechanic_id)))
+        else:
+            unlinked = _linked_mechanic_ids(ticket_id, mechanic_ids)
+            db.session.execute(stmt)
+        _links_changed([(ticket_id, mechanic_id) for mechanic_id in unlinked], "delete")
+
+
+def unlink_tickets(mechanic_id):
+    """
+    Detach every ticket from a mechanic with a single DELETE, before the
+    mechanic itself is deleted. Databases that enforce foreign keys would
+    cascade this anyway, but only this way is it logged and counted.
+    """
+    stmt = delete(service_mechanics).where(service_mechanics.c.mechanic_id == mechanic_id)
+    if db.session.get_bind().dialect.delete_returning:
+        ticket_ids = db.session.scalars(stmt.returning(service_mechanics.c.ticket_id)).all()
+    else:
+        ticket_ids = db.session.scalars(
+            select(service_mechanics.c.ticket_id).where(service_mechanics.c.mechanic_id == mechanic_id)
+        ).all()
+        db.session.execute(stmt)
+    _links_changed([(ticket_id, mechanic_id) for ticket_id in ticket_ids], "delete")
+
+
+def _linked_mechanic_ids(ticket_id, mechanic_ids):
+    return set(db.session.scalars(
+        select(service_mechanics.c.mechanic_id).where(
+            service_mechanics.c.ticket_id == ticket_id,
+            service_mechanics.c.mechanic_id.in_(mechanic_ids)
+        )
+    ))
+
+
+def _links_changed(links, operation):
+    """
+    Report ``(ticket_id, mechanic_id)`` links a Core statement really added
+    or removed to every dependant: cache tags, row versions, the change log
+    and the counters.
+    """
+    if not links:
+        return
+    ticket_ids = {ticket_id for ticket_id, _ in links}
+    # Both ends serialize the link, so both rows change version
+    mark_stale("service_mechanics")
+    touch_rows(ServiceTicket, ticket_ids)
+    touch_rows(Mechanics, {mechanic_id for _, mechanic_id in links})
+    log_changes(service_mechanics, links, operation)
+    tickets = db.session.execute(
+        select(ServiceTicket.ticket_id, ServiceTicket.date, ServiceTicket.customer_id)
+        .where(ServiceTicket.ticket_id.in_(ticket_ids))
+    ).all()
+    ticket_dates = {ticket_id: date for ticket_id, date, _ in tickets}
+    # The customers' summaries count who worked on their tickets
+    mark_stale(*{f"customers:{customer_id}" for _, _, customer_id in tickets})
+    count_links(
+        [(mechanic_id, ticket_dates.get(ticket_id)) for ticket_id, mechanic_id in links],
+        1 if operation == "insert" else -1
+    )
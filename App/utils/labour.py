@@ -0,0 +1,120 @@
+from itertools import chain
+import numpy as np
+from sqlalchemy import String, cast, select
+from App.extensions import db
+from App.models import Mechanics, ServiceTicket, service_mechanics
+
+# Labour cost model: a mechanic's monthly pay (salary / 12) is spread evenly
+# over the tickets they worked that month, so a ticket costs the sum of its
+# mechanics' shares. Months in which a mechanic has no tickets are unattributed.
+
+
+def labour_cost_report(start=None, end=None):
+    """
+    Labour cost per month, per mechanic, per mechanic-month and per ticket
+    for tickets dated in ``[start, end)`` (either bound may be None).
+
+    One Core query returns the links; every aggregate is a NumPy bincount
+    over them, so the cost grows with the link count only in C.
+    """
+    ticket_date = ServiceTicket.date
+    statement = (
+        select(
+            service_mechanics.c.mechanic_id,
+            service_mechanics.c.ticket_id,
+            # ISO text, so the month is its "YYYY-MM" prefix: no per-row date
+            # function in SQL and no datetime objects in Python
+            cast(ticket_date, String).label("date")
+        )
+        .join(ServiceTicket, ServiceTicket.ticket_id == service_mechanics.c.ticket_id)
+        .where(ticket_date.is_not(None))
+    )
+    if start:
+        statement = statement.where(ticket_date >= start)
+    if end:
+        statement = statement.where(ticket_date < end)
+
+    # Plain ids and text need no result processing, so skip building Rows
+    result = db.session.connection().execute(statement)
+    rows = result.cursor.fetchall()
+    result.close()
+    # Flattened straight into int64; np.array would inspect every tuple
+    links = np.fromiter(
+        chain.from_iterable(row[:2] for row in rows), dtype=np.int64, count=2 * len(rows)
+    ).reshape(-1, 2)
+    link_months = np.array([row[2] for row in rows], dtype="U7")
+    mechanics = db.session.execute(
+        select(Mechanics.mechanic_id, Mechanics.name, Mechanics.salary).order_by(Mechanics.mechanic_id)
+    ).all()
+    mechanic_ids = np.array([row.mechanic_id for row in mechanics], dtype=np.int64)
+    monthly_pay = np.array([row.salary or 0.0 for row in mechanics], dtype=np.float64) / 12
+
+    # Links whose mechanic was deleted meanwhile have no salary to attribute
+    mechanic_pos = np.searchsorted(mechanic_ids, links[:, 0])
+    known = mechanic_pos < len(mechanic_ids)
+    known[known] = mechanic_ids[mechanic_pos[known]] == links[known, 0]
+    links, link_months, mechanic_pos = links[known], link_months[known], mechanic_pos[known]
+
+    months, month_pos = np.unique(link_months, return_inverse=True)
+    tickets, ticket_pos = np.unique(links[:, 1], return_inverse=True)
+    n_mechanics, n_months = len(mechanic_ids), len(months)
+
+    # Tickets per (mechanic, month), flattened row-major
+    cell = mechanic_pos * n_months + month_pos
+    cell_tickets = np.bincount(cell, minlength=n_mechanics * n_months).reshape(n_mechanics, n_months)
+    cell_cost = np.where(cell_tickets > 0, monthly_pay[:, None], 0.0)
+
+    # Each link carries its mechanic's monthly pay split over that month's tickets
+    link_cost = monthly_pay[mechanic_pos] / cell_tickets.ravel()[cell]
+    ticket_cost = np.bincount(ticket_pos, weights=link_cost, minlength=len(tickets))
+    ticket_month = np.zeros(len(tickets), dtype=np.int64)
+    ticket_month[ticket_pos] = month_pos
+    month_tickets = np.bincount(ticket_month, minlength=n_months)
+
+    month_cost = cell_cost.sum(axis=0)
+    mechanic_cost = cell_cost.sum(axis=1)
+    mechanic_tickets = cell_tickets.sum(axis=1)
+    active = np.flatnonzero(mechanic_tickets)
+    cells = np.argwhere(cell_tickets)
+
+    return {
+        "total": {
+            "labour_cost": _money(month_cost.sum()),
+            "tickets": len(tickets),
+            "cost_per_ticket": _money(ticket_cost.mean()) if len(tickets) else None,
+            "median_ticket_cost": _money(np.median(ticket_cost)) if len(tickets) else None,
+            "max_ticket_cost": _money(ticket_cost.max()) if len(tickets) else None
+        },
+        "by_month": [
+            {
+                "month": str(months[m]),
+                "labour_cost": _money(month_cost[m]),
+                "tickets": int(month_tickets[m]),
+                "cost_per_ticket": _money(month_cost[m] / month_tickets[m])
+            }
+            for m in range(n_months)
+        ],
+        "by_mechanic": [
+            {
+                "mechanic_id": int(mechanic_ids[i]),
+                "name": mechanics[i].name,
+                "labour_cost": _money(mechanic_cost[i]),
+                "tickets": int(mechanic_tickets[i]),
+                "cost_per_ticket": _money(mechanic_cost[i] / mechanic_tickets[i])
+            }
+            for i in active
+        ],
+        "by_mechanic_month": [
+            {
+                "mechanic_id": int(mechanic_ids[i]),
+                "month": str(months[m]),
+                "labour_cost": _money(cell_cost[i, m]),
+                "tickets": int(cell_tickets[i, m])
+            }
+            for i, m in cells
+        ]
+    }
+
+
+def _money(value):
+    return round(float(value), 2)
@@ -0,0 +1,23 @@
+from flask import current_app
+from marshmallow_sqlalchemy.fields import Related, RelatedList
+from sqlalchemy.orm import raiseload, selectinload
+
+
+def eager_load(schema):
+    """
+    Build loader options that prefetch every relationship ``schema`` dumps.
+
+    Each related collection is fetched with one ``SELECT ... IN`` per page
+    instead of one lazy load per row. With ``STRICT_EAGER_LOADING`` enabled
+    any other relationship raises on access, so a schema that grows a field
+    without a matching eager load fails loudly instead of going N+1.
+    """
+    model = schema.opts.model
+    options = [
+        selectinload(getattr(model, field.attribute or name))
+        for name, field in schema.dump_fields.items()
+        if isinstance(field, (Related, RelatedList))
+    ]
+    if current_app.config.get("STRICT_EAGER_LOADING"):
+        options.append(raiseload("*"))
+    return options
@@ -0,0 +1,92 @@
+from sqlalchemy import inspect, select
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from App.extensions import db
+from App.models import ChangeLog, create_search_index
+from App.utils.changelog import SYNCED_TABLES, log_changes
+from App.utils.counters import rebuild_ticket_counters
+
+# The app has no migration tool: tables are made by create_all, which never
+# alters a table that already exists. This brings a database created by an
+# older release up to the current models in place, and is safe to rerun.
+
+# Replaced by ix_inventory_low_stock_item_id on the low_stock column
+OBSOLETE_INDEXES = {"inventory": ["ix_inventory_low_stock"]}
+
+
+def upgrade_schema():
+    """
+    Add every missing table, column and index, then backfill what the new
+    columns summarize: ticket counters, the search index and, for a change
+    log created here, one insert per existing synced row. Existing rows get
+    the column defaults (version 1, no reorder point, nothing reserved).
+    Returns the DDL statements it ran.
+    """
+    engine = db.engine
+    dialect = engine.dialect.name
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    had_change_log = ChangeLog.__tablename__ in existing
+    statements = []
+
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    statements += _add_column(connection, table, column, dialect)
+
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for name in OBSOLETE_INDEXES.get(table.name, []):
+                if name in indexes:
+                    statement = f"DROP INDEX {name} ON {table.name}" if dialect in ("mysql", "mariadb") \
+                        else f"DROP INDEX {name}"
+                    connection.exec_driver_sql(statement)
+                    statements.append(statement)
+
+    # New tables, and the indexes of the old ones (create_all skips what exists)
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                _create_index(connection, index, dialect)
+
+    create_search_index()
+    if not had_change_log:
+        _log_existing_rows()
+    rebuild_ticket_counters()
+    return statements
+
+
+def _add_column(connection, table, column, dialect):
+    definition = str(CreateColumn(column).compile(dialect=connection.dialect))
+    if dialect == "sqlite" and column.computed is not None:
+        # SQLite can only add a generated column as VIRTUAL; it is still indexable
+        definition = definition.replace(" STORED", " VIRTUAL")
+    statements = [f"ALTER TABLE {table.name} ADD COLUMN {definition}"]
+    if column.unique:
+        # ADD COLUMN cannot carry a UNIQUE constraint on every backend; an index does the same job
+        statements.append(
+            f"CREATE UNIQUE INDEX uq_{table.name}_{column.name} ON {table.name} ({column.name})"
+        )
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    return statements
+
+
+def _create_index(connection, index, dialect):
+    if dialect in ("sqlite", "postgresql"):
+        # Reflection misses SQLite expression indexes, so let the database check
+        connection.execute(CreateIndex(index, if_not_exists=True))
+    else:
+        index.create(connection, checkfirst=True)
+
+
+def _log_existing_rows():
+    # Sync clients start from an empty log, so rows older than it must be in it once
+    for table in SYNCED_TABLES.values():
+        columns = list(table.primary_key.columns)
+        keys = db.session.execute(select(*columns)).all()
+        log_changes(table, [tuple(key) if len(columns) > 1 else key[0] for key in keys], "insert")
+    db.session.commit()
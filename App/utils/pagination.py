@@ -0,0 +1,88 @@
+import base64
+import json
+from datetime import date, datetime
+
+from flask import request
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when an ``after`` cursor cannot be decoded.
+    """
+
+
+def get_limit(default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """
+    Read the ``limit`` query parameter, clamped to ``1..maximum``.
+    """
+    limit = request.args.get("limit", default, type=int)
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(*values):
+    """
+    Pack the sort key of the last row on a page into an opaque token.
+    """
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, columns):
+    """
+    Unpack a token produced by ``encode_cursor`` into values typed like ``columns``.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor length mismatch")
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def _coerce(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def _after(columns, values, descending):
+    """
+    Build ``(c1, c2, ...) > (v1, v2, ...)`` without relying on row-value support.
+    """
+    column, value = columns[0], values[0]
+    beyond = column < value if descending else column > value
+    if len(columns) == 1:
+        return beyond
+    return or_(beyond, and_(column == value, _after(columns[1:], values[1:], descending)))
+
+
+def keyset_page(query, columns, after=None, limit=DEFAULT_LIMIT, descending=False):
+    """
+    Fetch one page of ``query`` ordered by ``columns``, starting after the
+    ``after`` cursor. The last column must be unique so the order is total.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    Unlike OFFSET paging, the database seeks straight to the cursor through
+    the index on ``columns``, so deep pages cost the same as the first one.
+    """
+    if after:
+        query = query.filter(_after(columns, decode_cursor(after, columns), descending))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*(getattr(rows[-1], column.key) for column in columns))
+    return rows, next_cursor
@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Every hashing slot is taken; the caller should answer 503 and let the
+    client retry, rather than queue behind the burst.
+    """
+
+
+class PasswordHasher:
+    """
+    Bounded pool for password hashing and verification.
+
+    PBKDF2 and scrypt run in hashlib with the GIL released, so a thread
+    pool spreads them over cores. The calling request thread still waits
+    for its result: the pool bounds how many hashes run at once, and only
+    under a threaded worker (gthread) do the worker's other threads keep
+    serving meanwhile. At most ``workers`` hashes run and ``queue_depth``
+    more wait; past that, submissions fail fast with PasswordHasherBusy.
+    """
+
+    # How long a batch hash waits for a slot before giving up, in seconds
+    BATCH_SLOT_TIMEOUT = 5
+
+    def __init__(self, workers, queue_depth, method, salt_length):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch on the pool and return the hashes in input order.
+
+        Each hash holds a slot like any other, but at most ``workers`` of the
+        batch are queued at a time, so a login arriving mid-import waits
+        behind one hash, not the batch. A batch hash waits up to
+        BATCH_SLOT_TIMEOUT for a slot before raising PasswordHasherBusy.
+        """
+        window = threading.Semaphore(self.workers)
+        futures = []
+        try:
+            for password in passwords:
+                window.acquire()
+                if not self._slots.acquire(timeout=self.BATCH_SLOT_TIMEOUT):
+                    window.release()
+                    raise PasswordHasherBusy("Too many password checks in progress, retry shortly")
+                futures.append(self._submit(
+                    generate_password_hash, password, self.method, self.salt_length, on_done=window.release
+                ))
+            return [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        True if ``password_hash`` was made with other parameters than the
+        configured ones (method, hash function, iteration count or salt length).
+        """
+        parts = password_hash.split("$")
+        return (
+            len(parts) != 3
+            or parts[0] != _hash_parameters(self.method)
+            or len(parts[1]) != self.salt_length
+        )
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password checks in progress, retry shortly")
+        return self._submit(fn, *args).result()
+
+    def _submit(self, fn, *args, on_done=None):
+        # Runs ``fn`` on the pool with a slot already taken; the slot is freed when it finishes
+        def release(_):
+            self._slots.release()
+            if on_done:
+                on_done()
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            if on_done:
+                on_done()
+            raise
+        future.add_done_callback(release)
+        return future
+
+
+@lru_cache(maxsize=None)
+def _hash_parameters(method):
+    # "pbkdf2:sha256" stores as "pbkdf2:sha256:<default iterations>"; hash once to learn the prefix
+    return generate_password_hash("", method, salt_length=1).split("$", 1)[0]
+
+
+def password_hasher():
+    """
+    The current app's hashing pool (one per app, so per worker process).
+    """
+    hasher = current_app.extensions.get("password_hasher")
+    if hasher is None:
+        config = current_app.config
+        hasher = current_app.extensions.setdefault("password_hasher", PasswordHasher(
+            workers=config["PASSWORD_HASH_WORKERS"],
+            queue_depth=config["PASSWORD_HASH_QUEUE_DEPTH"],
+            method=config["PASSWORD_HASH_METHOD"],
+            salt_length=config["PASSWORD_SALT_LENGTH"]
+        ))
+    return hasher
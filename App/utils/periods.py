@@ -0,0 +1,17 @@
+from datetime import date
+
+
+def parse_period(period):
+    """
+    Half-open ``[start, end)`` date range of a ``YYYY`` or ``YYYY-MM``
+    period, or None for all time. Raises ValueError for anything else.
+    """
+    if not period:
+        return None
+    if len(period) == 4:
+        year = int(period)
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    if len(period) == 7 and period[4] == "-":
+        start = date(int(period[:4]), int(period[5:]), 1)
+        return start, date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    raise ValueError(period)
@@ -0,0 +1,139 @@
+import heapq
+import threading
+from flask import current_app
+from sqlalchemy import func, select
+from App.extensions import db
+from App.models import ChangeLogCompaction, Mechanics
+from App.utils.cache_tags import tag_versions
+from App.utils.changelog import log_position, read_log
+
+
+class LoadHeap:
+    """
+    Min-heap of ``(load, mechanic_id)``. Changed loads are pushed as new
+    entries and outdated ones skipped when they reach the top, so updates
+    and picks cost O(log n) and ties go to the lowest id.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._loads = {}  # mechanic_id -> current load; heap entries must match it
+
+    def load(self, rows):
+        self._loads = dict(rows)
+        self._heap = [(load, mechanic_id) for mechanic_id, load in self._loads.items()]
+        heapq.heapify(self._heap)
+
+    def set(self, mechanic_id, load):
+        if self._loads.get(mechanic_id) == load:
+            return
+        self._loads[mechanic_id] = load
+        heapq.heappush(self._heap, (load, mechanic_id))
+        if len(self._heap) > 2 * len(self._loads) + 64:
+            self.load(self._loads.items())
+
+    def remove(self, mechanic_id):
+        self._loads.pop(mechanic_id, None)
+
+    def take(self, exclude=()):
+        """
+        Add one to the least-loaded mechanic not in ``exclude`` and return
+        its id, or None if there is none.
+        """
+        skipped, chosen = [], None
+        while self._heap:
+            load, mechanic_id = heapq.heappop(self._heap)
+            if self._loads.get(mechanic_id) != load:
+                continue
+            if mechanic_id in exclude:
+                skipped.append((load, mechanic_id))
+                continue
+            chosen = mechanic_id
+            self._loads[mechanic_id] = load + 1
+            heapq.heappush(self._heap, (load + 1, mechanic_id))
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return chosen
+
+
+class WorkloadScheduler:
+    """
+    Mechanic workloads (linked tickets, i.e. Mechanics.ticket_count) for
+    one app in one process, held in a LoadHeap so picking the least-loaded
+    mechanic never counts service_mechanics.
+
+    Built on first use, then kept current from the change log: every
+    assign and remove, by any route or worker, logs the mechanic whose
+    counter moved. The log is only read after the ``mechanics`` or
+    ``service_mechanics`` tag moves. Workers balance independently, so two
+    of them may pick the same mechanic at once; the next refresh evens it out.
+    """
+
+    def __init__(self):
+        self.heap = LoadHeap()
+        self._ready = False
+        self._tag_version = None
+        self._last_change_id = 0
+        self._lock = threading.Lock()
+
+    def assign(self, ticket_ids, exclude=()):
+        """
+        Pick a mechanic for each ticket in turn, counting every pick toward
+        the next. Returns ``{ticket_id: mechanic_id}``, without the tickets
+        no mechanic was left for; the caller links and commits, or calls
+        ``forget`` if that fails.
+        """
+        with self._lock:
+            self._refresh()
+            assignments = {}
+            for ticket_id in ticket_ids:
+                mechanic_id = self.heap.take(exclude)
+                if mechanic_id is None:
+                    break
+                assignments[ticket_id] = mechanic_id
+            return assignments
+
+    def forget(self):
+        # Picks that were never committed: reload everything on next use
+        with self._lock:
+            self._ready = False
+
+    def _refresh(self):
+        tag_version = tag_versions(["mechanics", "service_mechanics"])
+        if self._ready and tag_version == self._tag_version:
+            return
+        horizon = db.session.scalar(select(func.max(ChangeLogCompaction.compacted_through)))
+        if not self._ready or (horizon is not None and self._last_change_id < horizon):
+            self._rebuild()
+        else:
+            self._apply_log()
+        self._tag_version = tag_version
+        self._ready = True
+
+    def _rebuild(self):
+        # Read the log position first, so changes made during the load are replayed
+        self._last_change_id = log_position()
+        self.heap.load(db.session.execute(select(Mechanics.mechanic_id, Mechanics.ticket_count)).all())
+
+    def _apply_log(self):
+        entries, self._last_change_id, _ = read_log(self._last_change_id, [Mechanics.__tablename__])
+        if not entries:
+            return
+
+        mechanic_ids = {int(entry.entity_id) for entry in entries}
+        loads = dict(db.session.execute(
+            select(Mechanics.mechanic_id, Mechanics.ticket_count).where(Mechanics.mechanic_id.in_(mechanic_ids))
+        ).all())
+        for mechanic_id in mechanic_ids:
+            if mechanic_id in loads:
+                self.heap.set(mechanic_id, loads[mechanic_id])
+            else:
+                self.heap.remove(mechanic_id)
+
+
+def workload_scheduler():
+    """
+    The current app's scheduler (one per app, so per worker process).
+    """
+    return current_app.extensions.setdefault("workload_scheduler", WorkloadScheduler())
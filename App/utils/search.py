@@ -0,0 +1,47 @@
+import re
+from sqlalchemy import func, literal_column, select
+from App.extensions import db
+from App.models import ServiceTicket, service_ticket_fts
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query):
+    """
+    Split free text into plain word terms, dropping search-syntax characters.
+    """
+    return TERM_PATTERN.findall(query or "")
+
+
+def ticket_search_statement(terms):
+    """
+    Build a ranked SELECT of ServiceTicket rows matching every term, using the
+    dialect's text index (FTS5 on SQLite, tsvector/GIN on Postgres).
+    """
+    dialect = db.engine.dialect.name
+
+    if dialect == "sqlite":
+        # Quote each term so FTS5 treats it as a literal token
+        match = " ".join(f'"{term}"' for term in terms)
+        return (
+            select(ServiceTicket)
+            .join(service_ticket_fts, service_ticket_fts.c.rowid == ServiceTicket.ticket_id)
+            .where(service_ticket_fts.c.description.match(match))
+            .order_by(func.bm25(literal_column("service_ticket_fts")), ServiceTicket.ticket_id)
+        )
+
+    if dialect == "postgresql":
+        # Same expression as the GIN index so the planner can use it
+        document = func.to_tsvector(literal_column("'english'"), ServiceTicket.description)
+        tsquery = func.plainto_tsquery(literal_column("'english'"), " ".join(terms))
+        return (
+            select(ServiceTicket)
+            .where(document.bool_op("@@")(tsquery))
+            .order_by(func.ts_rank(document, tsquery).desc(), ServiceTicket.ticket_id)
+        )
+
+    # No text index on other backends: fall back to substring matching
+    stmt = select(ServiceTicket)
+    for term in terms:
+        stmt = stmt.where(ServiceTicket.description.ilike(f"%{term}%"))
+    return stmt.order_by(ServiceTicket.date.desc(), ServiceTicket.ticket_id)
@@ -0,0 +1,86 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from App.extensions import db
+from App.models import Inventory, ServiceTicket, inventory_daily_usage, inventory_tickets
+from App.utils.cache_tags import mark_stale
+from App.utils.changelog import log_changes
+from App.utils.upserts import insert_or_add
+from App.utils.versioning import touch_rows
+
+# Stock moves never read-modify-write: each step is one conditional UPDATE,
+# so the check and the change are atomic without SELECT ... FOR UPDATE, and
+# the contended inventory row is written last to hold its lock only until
+# the caller commits.
+
+
+def reserve_stock(ticket_id, item_id, quantity):
+    """
+    Move ``quantity`` units of an item from stock onto a ticket's line.
+
+    Returns False, changing nothing the caller will commit, if fewer than
+    ``quantity`` units are in stock; the caller must roll back.
+    """
+    db.session.execute(
+        insert_or_add(inventory_tickets, inventory_tickets.c.quantity),
+        {"ticket_id": ticket_id, "item_id": item_id, "quantity": quantity}
+    )
+    _record_usage(item_id, quantity)
+    inventory = Inventory.__table__
+    taken = db.session.execute(
+        update(inventory)
+        .where(inventory.c.item_id == item_id, inventory.c.quantity >= quantity)
+        .values(quantity=inventory.c.quantity - quantity)
+    ).rowcount
+    if not taken:
+        return False
+
+    _mark_moved(ticket_id, item_id)
+    # A new line changes the ticket's payload too
+    touch_rows(ServiceTicket, [ticket_id])
+    return True
+
+
+def release_stock(ticket_id, item_id, quantity):
+    """
+    Return ``quantity`` units from a ticket's line to stock.
+
+    Returns False if the line holds fewer than ``quantity`` units.
+    """
+    released = db.session.execute(
+        update(inventory_tickets)
+        .where(
+            inventory_tickets.c.ticket_id == ticket_id,
+            inventory_tickets.c.item_id == item_id,
+            inventory_tickets.c.quantity >= quantity
+        )
+        .values(quantity=inventory_tickets.c.quantity - quantity)
+    ).rowcount
+    if not released:
+        return False
+
+    _record_usage(item_id, -quantity)
+    inventory = Inventory.__table__
+    db.session.execute(
+        update(inventory)
+        .where(inventory.c.item_id == item_id)
+        .values(quantity=inventory.c.quantity + quantity)
+    )
+    _mark_moved(ticket_id, item_id)
+    return True
+
+
+def _record_usage(item_id, used):
+    # Net units taken today, for the low-stock report's usage velocity
+    db.session.execute(
+        insert_or_add(inventory_daily_usage, inventory_daily_usage.c.quantity),
+        {"item_id": item_id, "day": datetime.utcnow().date(), "quantity": used}
+    )
+
+
+def _mark_moved(ticket_id, item_id):
+    # The version column's onupdate already bumped the item; report the rest,
+    # including the ticket's customer, whose summary totals the parts
+    customer_id = db.session.scalar(select(ServiceTicket.customer_id).where(ServiceTicket.ticket_id == ticket_id))
+    mark_stale("inventory", f"inventory:{item_id}", "inventory_tickets", f"customers:{customer_id}")
+    log_changes(Inventory.__table__, [item_id], "update")
+    log_changes(inventory_tickets, [(ticket_id, item_id)], "update")
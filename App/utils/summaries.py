@@ -0,0 +1,85 @@
+from sqlalchemy import func, select, true
+from App.extensions import db
+from App.models import Customer, Inventory, Mechanics, ServiceTicket, inventory_tickets, service_mechanics
+
+
+def customer_summary(customer_id, top_mechanics):
+    """
+    Visit count, first and last visit, parts cost and the most-seen
+    mechanics of one customer, or None if there is no such customer.
+
+    One statement: the totals are one-row aggregates over the customer's
+    tickets (ix_service_ticket_customer_date_ticket_id), joined to their
+    links grouped per mechanic, so no ticket is ever sent back.
+    """
+    tickets = select(ServiceTicket.ticket_id).where(ServiceTicket.customer_id == customer_id)
+    visits = select(
+        func.count().label("visits"),
+        func.min(ServiceTicket.date).label("first_visit"),
+        func.max(ServiceTicket.date).label("last_visit")
+    ).where(ServiceTicket.customer_id == customer_id).subquery()
+
+    # Parts are billed by the units reserved on the line; a released line costs nothing
+    parts_cost = (
+        select(func.coalesce(func.sum(inventory_tickets.c.quantity * Inventory.price), 0.0))
+        .select_from(inventory_tickets)
+        .join(Inventory, Inventory.item_id == inventory_tickets.c.item_id)
+        .where(inventory_tickets.c.ticket_id.in_(tickets))
+        .scalar_subquery()
+    )
+
+    mechanic_visits = func.count().label("visits")
+    seen = (
+        select(
+            service_mechanics.c.mechanic_id,
+            mechanic_visits,
+            func.max(ServiceTicket.date).label("last_seen")
+        )
+        .join(ServiceTicket, ServiceTicket.ticket_id == service_mechanics.c.ticket_id)
+        .where(ServiceTicket.customer_id == customer_id)
+        .group_by(service_mechanics.c.mechanic_id)
+        .order_by(mechanic_visits.desc(), service_mechanics.c.mechanic_id)
+        .limit(top_mechanics)
+        .subquery()
+    )
+
+    # One row per top mechanic, or a single row with NULL mechanic columns
+    rows = db.session.execute(
+        select(
+            Customer.customer_id,
+            Customer.name,
+            *visits.c,
+            parts_cost.label("parts_cost"),
+            seen.c.mechanic_id,
+            Mechanics.name.label("mechanic_name"),
+            seen.c.visits.label("mechanic_visits"),
+            seen.c.last_seen
+        )
+        .select_from(Customer)
+        .join(visits, true())
+        .outerjoin(seen, true())
+        .outerjoin(Mechanics, Mechanics.mechanic_id == seen.c.mechanic_id)
+        .where(Customer.customer_id == customer_id)
+        .order_by(seen.c.visits.desc(), seen.c.mechanic_id)
+    ).all()
+    if not rows:
+        return None
+
+    first = rows[0]
+    return {
+        "customer_id": first.customer_id,
+        "name": first.name,
+        "visits": first.visits,
+        "first_visit": first.first_visit.isoformat() if first.first_visit else None,
+        "last_visit": first.last_visit.isoformat() if first.last_visit else None,
+        "parts_cost": round(float(first.parts_cost), 2),
+        "top_mechanics": [
+            {
+                "mechanic_id": row.mechanic_id,
+                "name": row.mechanic_name,
+                "visits": row.mechanic_visits,
+                "last_seen": row.last_seen.isoformat() if row.last_seen else None
+            }
+            for row in rows if row.mechanic_id is not None
+        ]
+    }
@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, event, select
+from App.extensions import db
+from App.models import RevokedToken
+from App.utils.cache_tags import tag_versions
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by a digest of the token so
+    raw tokens never sit in memory. An entry is dropped once its ``exp``
+    passes, so a cache hit is never more permissive than decoding again.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, key, claims):
+        if self.size <= 0 or "exp" not in claims:
+            return
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RevocationList:
+    """
+    Ids of revoked, not yet expired tokens, as an in-process set.
+
+    Revocations are stored in ``revoked_tokens`` so every worker honours
+    them. A worker applies its own at once and picks up the others' when
+    the ``revoked_tokens`` cache tag moves, checking the tag at most every
+    ``sync_interval`` seconds (0 checks on every request).
+    """
+
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self._revoked = frozenset()
+        self._tag_version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, token_id):
+        self._sync()
+        return token_id in self._revoked
+
+    def add(self, token_id, expires_at):
+        """
+        Revoke a token id until ``expires_at`` (naive UTC). The caller
+        commits; this worker applies the revocation once the commit succeeds.
+        """
+        db.session.merge(RevokedToken(jti=token_id, expires_at=expires_at))
+        # Expired revocations can never match again
+        db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+        db.session.info.setdefault("revoked_token_ids", set()).add(token_id)
+
+    def _apply(self, token_ids):
+        with self._lock:
+            self._revoked = self._revoked | token_ids
+
+    def _sync(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.sync_interval:
+                return
+            tag_version = tag_versions(["revoked_tokens"])[0]
+            if tag_version != self._tag_version:
+                self._revoked = frozenset(db.session.scalars(
+                    select(RevokedToken.jti).where(RevokedToken.expires_at >= datetime.utcnow())
+                ))
+                self._tag_version = tag_version
+            self._checked_at = now
+
+
+@event.listens_for(db.session, "after_commit")
+def _apply_committed_revocations(session):
+    token_ids = session.info.pop("revoked_token_ids", None)
+    if token_ids:
+        revoked_tokens()._apply(token_ids)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_rolled_back_revocations(session):
+    session.info.pop("revoked_token_ids", None)
+
+
+def token_key(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_id(claims, key):
+    """
+    Revocation id of a token: its ``jti``, or its digest for tokens issued
+    without one.
+    """
+    return claims.get("jti") or key
+
+
+def token_cache():
+    """
+    The current app's verified-claims cache (one per app, so per worker process).
+    """
+    cache = current_app.extensions.get("token_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("token_cache", TokenCache(current_app.config["TOKEN_CACHE_SIZE"]))
+    return cache
+
+
+def revoked_tokens():
+    """
+    The current app's revocation list (one per app, so per worker process).
+    """
+    revoked = current_app.extensions.get("revoked_tokens")
+    if revoked is None:
+        revoked = current_app.extensions.setdefault(
+            "revoked_tokens", RevocationList(current_app.config["TOKEN_REVOCATION_SYNC_SECONDS"])
+        )
+    return revoked
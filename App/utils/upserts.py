@@ -0,0 +1,79 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from App.extensions import db
+
+
+def insert_ignore(table):
+    """
+    Dialect-aware INSERT that silently skips rows whose key already exists,
+    so duplicate links cost nothing instead of a lookup round trip.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql_insert(table).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(table).prefix_with("IGNORE")
+    return insert(table)
+
+
+def insert_or_add(table, column):
+    """
+    Dialect-aware INSERT that, when the row's key already exists, adds the
+    inserted ``column`` value to the stored one instead, in one statement.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({column.name: column + stmt.inserted[column.name]})
+    stmt = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={column.name: column + stmt.excluded[column.name]}
+    )
+
+
+def insert_or_update(table, key_columns, update_columns):
+    """
+    Dialect-aware upsert: INSERT, or overwrite ``update_columns`` of the row
+    that already has the same ``key_columns``, in one statement. A version
+    column on the table is bumped, since ON CONFLICT skips its onupdate.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(table)
+        new_values = stmt.inserted
+    else:
+        stmt = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)
+        new_values = stmt.excluded
+
+    assignments = {column.name: new_values[column.name] for column in update_columns}
+    if "version" in table.c:
+        assignments["version"] = table.c.version + 1
+    if dialect in ("mysql", "mariadb"):
+        return stmt.on_duplicate_key_update(assignments)
+    return stmt.on_conflict_do_update(index_elements=list(key_columns), set_=assignments)
+
+
+def insert_returning_ids(model, rows):
+    """
+    Insert ``rows`` set-based and return their primary keys in input order.
+    """
+    primary_key = model.__table__.primary_key.columns[0]
+    dialect = db.session.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        # Batched multi-row INSERT ... RETURNING, ids kept in parameter order
+        result = db.session.execute(
+            insert(model).returning(primary_key, sort_by_parameter_order=True),
+            rows
+        )
+        return list(result.scalars())
+
+    # Dialects without RETURNING (MySQL) still share the one transaction
+    return [
+        db.session.execute(insert(model).values(**row)).inserted_primary_key[0]
+        for row in rows
+    ]
@@ -1,10 +1,10 @@
+import uuid
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, request, jsonify, g
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-import os
+from App.utils.tokens import revoked_tokens, token_cache, token_id, token_key
 
-SECRET_KEY = os.environ.get("SECRET_KEY") or "your_secret_key"
 ALGORITHM = "HS256"
 
 
@@ -15,36 +15,50 @@ def encode_token(customer_id):
     payload = {
         'exp': datetime.utcnow() + timedelta(hours=1),
         'iat': datetime.utcnow(),
-        'sub': str(customer_id)
+        'sub': str(customer_id),
+        'jti': uuid.uuid4().hex  # Lets logout revoke this token alone
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm=ALGORITHM)
 
 
-from functools import wraps
-from flask import request, jsonify
-from jose import jwt, JWTError
+def bearer_token():
+    """
+    The token from an ``Authorization: Bearer <token>`` header, or None.
+    """
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) == 2 and parts[0].lower() == 'bearer':
+        return parts[1]
+    return None
 
-SECRET_KEY = "your_secret_key"
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-
-        # Check if the Authorization header is present
-        if 'Authorization' in request.headers:
-            token = request.headers['Authorization'].split(" ")[1]
-
+        token = bearer_token()
         if not token:
             return jsonify({'message': 'Token is missing!'}), 403
 
-        try:
-            # Decode the token
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            customer_id = data.get("sub")  # Extract customer_id from the token payload
-        except JWTError:
-            return jsonify({'message': 'Invalid token!'}), 403
+        # A token seen before costs a dictionary lookup; new ones are verified once
+        key = token_key(token)
+        cache = token_cache()
+        data = cache.get(key)
+        if data is None:
+            try:
+                data = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=[ALGORITHM])
+            except JWTError:
+                return jsonify({'message': 'Invalid token!'}), 403
+            cache.set(key, data)
+
+        if token_id(data, key) in revoked_tokens():
+            cache.discard(key)
+            return jsonify({'message': 'Token has been revoked!'}), 403
+
+        customer_id = data.get("sub")  # Extract customer_id from the token payload
+
+        # Expose the caller to code below the view (e.g. per-customer cache keys)
+        g.customer_id = customer_id
+        g.token_claims = data
 
         return f(customer_id, *args, **kwargs)
 
-    return decorated
\ No newline at end of file
+    return decorated
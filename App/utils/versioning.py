@@ -0,0 +1,157 @@
+import hashlib
+from collections import defaultdict
+from functools import wraps
+from itertools import chain
+from flask import current_app, make_response, request
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.interfaces import MANYTOONE
+from App.extensions import db
+from App.utils.cache_tags import mark_stale, tag_versions
+
+
+def is_versioned(model):
+    return "version" in model.__table__.c
+
+
+# ---------------------------------------------------------
+# KEEPING VERSIONS CURRENT
+# ---------------------------------------------------------
+def touch_rows(model, ids):
+    """
+    Record a change to rows that Core statements modified indirectly (e.g.
+    a junction-table write that alters their payload): bump their version
+    and queue their cache tags for invalidation on commit.
+    """
+    ids = {row_id for row_id in ids if row_id is not None}
+    if not ids:
+        return
+    table = model.__table__
+    primary_key = table.primary_key.columns[0]
+    if is_versioned(model):
+        db.session.execute(
+            update(table).where(primary_key.in_(ids)).values(version=table.c.version + 1)
+        )
+    mark_stale(table.name, *(f"{table.name}:{row_id}" for row_id in ids))
+
+
+@event.listens_for(db.session, "before_flush")
+def _bump_related_versions(session, flush_context, instances):
+    """
+    The onupdate on ``version`` covers column changes. This covers the rest:
+    rows whose serialized payload changes because a relationship changed,
+    which the ORM would otherwise write without touching the row itself.
+    Those rows are also queued for cache invalidation.
+    """
+    touched = defaultdict(set)
+    unlinked = defaultdict(set)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        for relationship in state.mapper.relationships:
+            target = relationship.mapper.class_
+            if not is_versioned(target):
+                continue
+
+            if relationship.secondary is not None:
+                history = attributes.get_history(
+                    obj, relationship.key, passive=attributes.PASSIVE_NO_INITIALIZE
+                )
+                for related in chain(history.added or (), history.deleted or ()):
+                    touched[target].add(inspect(related).mapper.primary_key_from_instance(related)[0])
+                if deleted:
+                    # The flush will delete every link row, loaded or not
+                    unlinked[relationship].add(state.mapper.primary_key_from_instance(obj)[0])
+
+            elif relationship.direction is MANYTOONE:
+                for local, _ in relationship.local_remote_pairs:
+                    key = state.mapper.get_property_by_column(local).key
+                    history = attributes.get_history(obj, key)
+                    if deleted or obj in session.new or history.has_changes():
+                        touched[target].update(v for v in history.sum() if v is not None)
+
+        # A relationship-only change issues no UPDATE on the row, so force one
+        if (obj in session.dirty and is_versioned(type(obj)) and session.is_modified(obj)
+                and not _has_column_changes(state)):
+            obj.version = type(obj).version + 1
+
+    # Resolve the far side of every link about to be deleted, one IN query per relationship
+    for relationship, parent_ids in unlinked.items():
+        _, local_link = relationship.synchronize_pairs[0]
+        _, remote_link = relationship.secondary_synchronize_pairs[0]
+        touched[relationship.mapper.class_].update(
+            session.scalars(select(remote_link).where(local_link.in_(parent_ids)))
+        )
+
+    for model, ids in touched.items():
+        table = model.__table__
+        ids.discard(None)
+        if ids:
+            session.execute(
+                update(table).where(table.primary_key.columns[0].in_(ids)).values(version=table.c.version + 1)
+            )
+            mark_stale(*(f"{table.name}:{row_id}" for row_id in ids), session=session)
+
+
+def _has_column_changes(state):
+    return any(
+        state.attrs[prop.key].history.has_changes() for prop in state.mapper.column_attrs
+    )
+
+
+# ---------------------------------------------------------
+# ETAGS / CONDITIONAL GET
+# ---------------------------------------------------------
+def row_etag(model, row_id):
+    """
+    Strong ETag for one row, read from its version column. None if missing.
+    """
+    table = model.__table__
+    version = db.session.scalar(
+        select(table.c.version).where(table.primary_key.columns[0] == row_id)
+    )
+    if version is None:
+        return None
+    return _digest(table.name, row_id, version)
+
+
+def collection_etag(*tags):
+    """
+    ETag for a listing, from the version tokens of the cache tags its payload
+    depends on (the same tags as its ``cached_view``): any commit touching
+    them changes it, and it costs one cache read however large the table.
+    The request URL is mixed in so each filter and page has its own tag.
+    """
+    return _digest(request.full_path, *tag_versions(tags))
+
+
+def _digest(*parts):
+    return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def conditional(etag_for):
+    """
+    Answer ``If-None-Match`` with 304 before the view runs, so a matching
+    poll costs one indexed lookup and no serialization. ``etag_for`` gets
+    the view's URL arguments and returns the current ETag, or None to skip.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            etag = etag_for(**kwargs)
+            if etag is None:
+                return f(*args, **kwargs)
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,171 @@
+"""
+Concurrent read/write throughput against gunicorn on a file-backed SQLite
+database, without and with the SQLite tuning in App/config.py
+(SQLITE_PRAGMAS; SQLITE_TUNING=false keeps only foreign_keys).
+
+Each mode gets a fresh database, then ``--clients`` threads mix
+customer reads (GET /customers/<id>) with ticket writes (POST /tickets/)
+for ``--seconds``.
+
+    python benchmarks/db_throughput.py --workers 4 --threads 4 --clients 32
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CUSTOMERS = 200
+
+SEED = f"""
+import json
+from App import create_app, db
+from App.models import Customer
+from App.utils.util import encode_token
+app = create_app("ProductionConfig")
+with app.app_context():
+    db.create_all()
+    db.session.add_all([
+        Customer(name=f"Bench {{n}}", email=f"bench{{n}}@example.com", address="1 Bench St",
+                 phone="555", password_hash="x")
+        for n in range({CUSTOMERS})
+    ])
+    db.session.commit()
+    print(json.dumps([encode_token(n) for n in range(1, {CUSTOMERS} + 1)]))
+"""
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/customers/health", timeout=1)
+            return
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not start")
+
+
+def request(method, url, body=None, token=None):
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        return None  # Counted as an error, like a 5xx
+
+
+def run_clients(base_url, tokens, clients, seconds, write_ratio):
+    stop = time.monotonic() + seconds
+    results = {"read": [], "write": [], "errors": 0}
+    lock = threading.Lock()
+
+    def client():
+        rng = random.Random()
+        while time.monotonic() < stop:
+            customer = rng.randrange(CUSTOMERS)
+            write = rng.random() < write_ratio
+            started = time.perf_counter()
+            if write:
+                status = request("POST", f"{base_url}/tickets/",
+                                 {"description": "Benchmark job", "date": "2024-01-01T09:00:00"},
+                                 tokens[customer])
+            else:
+                status = request("GET", f"{base_url}/customers/{customer + 1}")
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status in (200, 201):
+                    results["write" if write else "read"].append(elapsed)
+                else:
+                    results["errors"] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def bench(tuned, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            RENDER="true",  # ProductionConfig
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp}/bench.db",
+            CACHE_DIR=os.path.join(tmp, "cache"),
+            SQLITE_TUNING="true" if tuned else "false",
+        )
+        tokens = json.loads(subprocess.run(
+            [sys.executable, "-c", SEED], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+        ).stdout.strip().splitlines()[-1])
+
+        port = free_port()
+        server = subprocess.Popen(
+            ["gunicorn", "--workers", str(args.workers), "--threads", str(args.threads),
+             "--worker-class", "gthread", "--bind", f"127.0.0.1:{port}", "flask_app:app"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_until_up(base_url)
+            return run_clients(base_url, tokens, args.clients, args.seconds, args.write_ratio)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.threads} threads, {args.clients} clients, "
+          f"{args.seconds:g}s, {args.write_ratio:.0%} writes")
+    print(f"{'mode':<10}{'reads/s':>10}{'writes/s':>10}{'read p95':>11}{'write p95':>11}{'errors':>8}")
+    for name, tuned in (("baseline", False), ("tuned", True)):
+        results = bench(tuned, args)
+        print(
+            f"{name:<10}"
+            f"{len(results['read']) / args.seconds:>10.1f}"
+            f"{len(results['write']) / args.seconds:>10.1f}"
+            f"{percentile(results['read'], 95) * 1000:>9.1f}ms"
+            f"{percentile(results['write'], 95) * 1000:>9.1f}ms"
+            f"{results['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()